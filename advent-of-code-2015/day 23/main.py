@@ -1,81 +1,139 @@
 """Advent of Code 2015 Day 23."""
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.codegen import (  # noqa: E402
+    compile_function, get_dispatch, get_leaders, get_local_names)
+from aoc.inputs import read_lines  # noqa: E402
+from aoc.vm import decode, run  # noqa: E402
+
+JUMPS = {'jmp', 'jie', 'jio'}
 
 
 def main(file_input='input.txt'):
-    lines = [line.strip() for line in get_file_contents(file_input)]
+    lines = read_lines(file_input)
     instructions = parse_instructions(lines)
-    register = process(instructions, {'a': 0, 'b': 0})
+    program = compile_program(instructions)
+    register = program({'a': 0, 'b': 0})
     print(f"Value of b after finishing execution: {register['b']}")
-    register_stage2 = process(instructions, {'a': 1, 'b': 0})
+    register_stage2 = program({'a': 1, 'b': 0})
     print('Value of b after finishing execution, when a started as 1: '
           f"{register_stage2['b']}")
 
 
-def process(instructions, register):
-    """Process instructions with starting register."""
-    cur_position = 0
-    while cur_position < len(instructions):
-        to_process, *params = instructions[cur_position]
-        result = process_instruction(register,
-                                     cur_position,
-                                     to_process,
-                                     *params)
-        if result is not None:
-            cur_position = result
+def compile_program(instructions):
+    """Compile instructions to function processing starting register.
+
+    Function returns register after processing, like process does.
+    """
+    names = get_local_names(
+        {'a', 'b'} | {params[0] for name, *params in instructions
+                      if name != 'jmp'})
+    jumps = [(pointer, pointer + instruction[-1])
+             for pointer, instruction in enumerate(instructions)
+             if instruction[0] in JUMPS]
+    leaders = get_leaders(len(instructions), jumps)
+    blocks = [
+        (start, get_block_lines(instructions[start:end], start, names))
+        for start, end in zip(leaders, leaders[1:] + [len(instructions)])]
+    body = (
+        [f"{local} = register.get('{name}', 0)"
+         for name, local in names.items()]
+        + ['pc = 0', f'while 0 <= pc < {len(instructions)}:']
+        + get_dispatch(blocks, '    ')
+        + ['return {'
+           + ', '.join(f"'{name}': {local}" for name, local in names.items())
+           + '}'])
+    return compile_function('program', ['register'], body)
+
+
+def get_block_lines(instructions, start, names):
+    """Get lines of basic block of instructions, starting at start."""
+    lines = []
+    for pointer, (name, *params) in enumerate(instructions, start):
+        if name == 'hlf':
+            lines.append(f'{names[params[0]]} //= 2')
+        elif name == 'tpl':
+            lines.append(f'{names[params[0]]} *= 3')
+        elif name == 'inc':
+            lines.append(f'{names[params[0]]} += 1')
+        elif name == 'jmp':
+            lines.append(f'pc = {pointer + params[0]}')
         else:
-            cur_position += 1
-    return register
+            local, offset = names[params[0]], params[1]
+            check = f'{local} % 2 == 0' if name == 'jie' else f'{local} == 1'
+            lines.extend([f'if {check}:', f'    pc = {pointer + offset}',
+                          'else:', f'    pc = {pointer + 1}'])
+    if instructions[-1][0] not in JUMPS:
+        lines.append(f'pc = {start + len(instructions)}')
+    return lines
 
 
-def process_instruction(register, cur_position, instruction, *params):
-    """Process instruction on register or cur_position."""
-    instructions = {
-        'hlf': (hlf, (register, *params)),
-        'tpl': (tpl, (register, *params)),
-        'inc': (inc, (register, *params)),
-        'jmp': (jmp, (cur_position, *params)),
-        'jie': (jie, (register, cur_position, *params)),
-        'jio': (jio, (register, cur_position, *params)),
-    }
-    to_process, arguments = instructions[instruction]
-    return to_process(*arguments)
+def process(instructions, register, profile=None):
+    """Process instructions with starting register."""
+    run(decode(instructions, DECODERS, register), profile=profile)
+    return register
 
 
 def hlf(register, reg_name):
-    """Divide by two reg_name value in register."""
-    set_register(register, reg_name, register[reg_name] / 2)
+    """Decode hlf: divide by two reg_name value in register."""
+    def operation(pointer):
+        register[reg_name] //= 2
+        return pointer + 1
+    return operation
 
 
 def tpl(register, reg_name):
-    """Triple reg_name value in register."""
-    set_register(register, reg_name, register[reg_name] * 3)
+    """Decode tpl: triple reg_name value in register."""
+    def operation(pointer):
+        register[reg_name] *= 3
+        return pointer + 1
+    return operation
 
 
 def inc(register, reg_name):
-    """Increase by one reg_name value in register."""
-    set_register(register, reg_name, register[reg_name] + 1)
+    """Decode inc: increase by one reg_name value in register."""
+    def operation(pointer):
+        register[reg_name] += 1
+        return pointer + 1
+    return operation
 
 
-def jmp(cur_position, value_change):
-    """Jump relatively from cur_position by value_change."""
-    return cur_position + value_change
+def jmp(register, value_change):
+    """Decode jmp: jump relatively by value_change."""
+    def operation(pointer):
+        return pointer + value_change
+    return operation
 
 
-def jie(register, cur_instruction, reg_name, value_change):
-    """Jump if even instruction."""
-    if register[reg_name] % 2 == 0:
-        return jmp(cur_instruction, value_change)
+def jie(register, reg_name, value_change):
+    """Decode jie: jump relatively if reg_name value is even."""
+    def operation(pointer):
+        if register[reg_name] % 2 == 0:
+            return pointer + value_change
+        return pointer + 1
+    return operation
 
 
-def jio(register, cur_instruction, reg_name, value_change):
-    """Jump if one instruction."""
-    if register[reg_name] == 1:
-        return jmp(cur_instruction, value_change)
+def jio(register, reg_name, value_change):
+    """Decode jio: jump relatively if reg_name value is one."""
+    def operation(pointer):
+        if register[reg_name] == 1:
+            return pointer + value_change
+        return pointer + 1
+    return operation
 
 
-def set_register(register, reg_name, value):
-    """Set value for reg_name in register."""
-    register[reg_name] = value
+DECODERS = {
+    'hlf': hlf,
+    'tpl': tpl,
+    'inc': inc,
+    'jmp': jmp,
+    'jie': jie,
+    'jio': jio,
+}
 
 
 def parse_instructions(lines):
@@ -93,11 +151,5 @@ def parse_instruction(line):
     return (instruction, int(element))
 
 
-def get_file_contents(file):
-    """Read all lines from file."""
-    with open(file) as f:
-        return f.readlines()
-
-
 if __name__ == '__main__':
     main()
@@ -1,26 +1,25 @@
 """Advent of Code 2015 Day 4."""
-import hashlib
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.hashing import find_lowest  # noqa: E402
 
 
 def main():
     key = 'bgvyzdsv'
-    number = get_number_suffix(key, startwith='00000')
+    processes = os.cpu_count()
+    number = get_number_suffix(key, 5, processes=processes)
     print(f'Lowest number making hash start with five zeros {number}')
-    number6 = get_number_suffix(key, startwith='000000', start_number=number)
+    number6 = get_number_suffix(key, 6, start_number=number,
+                                processes=processes)
     print(f'Lowest number making hash start with six zeros {number6}')
 
 
-def get_number_suffix(key, startwith, start_number=1):
-    """Get number suffix of key making hash start with startwith."""
-    number = start_number
-    while not get_md5(f'{key}{number}').startswith(startwith):
-        number += 1
-    return number
-
-
-def get_md5(text):
-    """Get md5 hash of text."""
-    return hashlib.md5(text.encode()).hexdigest()
+def get_number_suffix(key, zeros, start_number=1, processes=None):
+    """Get number suffix of key making hash start with zeros zeros."""
+    return find_lowest(key, zeros, start_number, processes)
 
 
 if __name__ == '__main__':
@@ -1,58 +1,60 @@
 """Advent of Code 2016 Day 14."""
-import hashlib
+import os
 import re
+import sys
+from collections import defaultdict, deque
+from itertools import islice
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.hashing import iter_stretched  # noqa: E402
 
 
 puzzle = 'zpqevtbw'
+WINDOW = 1000
+TRIPLE = re.compile(r'(.)\1\1')
+QUINTUPLE = re.compile(r'(.)\1{4}')
 
 
 def main(salt=puzzle):
-    key_index, _ = find_nth_pad_key(puzzle, 64)
+    processes = os.cpu_count()
+    key_index, _ = find_nth_pad_key(salt, 64, processes=processes)
     print(f'Index producing 64th key: {key_index}')
-    key_index, _ = find_nth_pad_key(puzzle, 64, 2017)
+    key_index, _ = find_nth_pad_key(salt, 64, 2017, processes)
     print(f'Index producing 64th key with hashing 2017 times: {key_index}')
 
 
-def find_nth_pad_key(salt, key_number, stretch=1):
+def find_nth_pad_key(salt, key_number, stretch=1, processes=None):
     """Find key_number key using salt and stretch number times hashing."""
-    keys = []
-    hashes = []
-    index = 0
-    while len(keys) < key_number:
-        while True:
-            if len(hashes) <= index:
-                hashes.append(get_hash(salt, index, stretch))
-            repeat_check = is_repeating(hashes[index], r'[\w\d]', 3)
-            if repeat_check:
-                hash_index = index + 1000
-                repeating_char = repeat_check[0]
-                break
-            index += 1
-        while len(hashes) <= hash_index:
-            hashes.append(get_hash(salt, len(hashes), stretch))
-        for index_to_check in range(index + 1, hash_index + 1):
-            if is_repeating(hashes[index_to_check], repeating_char, 5):
-                keys.append((index, hashes[index]))
-                break
-        index += 1
-    return keys[-1]
-
-
-def is_repeating(text, char, number_times):
-    """Find char or regex group num_times in row in text."""
-    regex = fr'({char})\1{{{number_times - 1}}}'
-    result = re.findall(regex, text)
-    if result:
-        return result
-    return None
-
-
-def get_hash(salt, index, stretch):
-    """Hash seed with appended index stretch number of times."""
-    result = f'{salt}{index}'
-    for _ in range(stretch):
-        result = hashlib.md5(result.encode()).hexdigest()
-    return result
+    return next(islice(find_pad_keys(salt, stretch, processes),
+                       key_number - 1, None))
+
+
+def find_pad_keys(salt, stretch=1, processes=None):
+    """Yield (index, hash) of keys using salt, in order of indexes.
+
+    Hash with triple is checked, when the next WINDOW hashes are known.
+    Indexes of hashes with quintuple are kept for every character, so only
+    those of its triple character are checked.
+    """
+    window = deque()
+    quintuples = defaultdict(deque)
+    hashes = iter_stretched(salt, stretch, processes)
+    for index, hash_ in enumerate(hashes):
+        for char in set(QUINTUPLE.findall(hash_)):
+            quintuples[char].append(index)
+        triple = TRIPLE.search(hash_)
+        window.append((index, hash_, triple and triple.group(1)))
+        if len(window) <= WINDOW:
+            continue
+        key_index, key_hash, char = window.popleft()
+        if char is None:
+            continue
+        indexes = quintuples[char]
+        while indexes and indexes[0] <= key_index:
+            indexes.popleft()
+        if indexes:
+            yield key_index, key_hash
 
 
 if __name__ == '__main__':
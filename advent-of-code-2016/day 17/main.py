@@ -1,7 +1,9 @@
 """Advent of Code 2016 Day 17."""
-from collections import deque
 import hashlib
-import re
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 
 puzzle = 'ioramepc'
@@ -11,63 +13,110 @@ MOVES = (
     ((0, -1), 'L'),
     ((0, 1), 'R'),
 )
+OPEN = 0xb
+CHUNKS_PER_PROCESS = 4
 
 
 def main(passcode=puzzle):
-    grid = get_grid(4)
-    shortest, *_, longest = sorted(find_paths(grid, passcode), key=len)
+    shortest, longest = find_paths(passcode, 4, os.cpu_count())
     print(f'Shortest path: {shortest}')
-    print(f'Length of the longest path: {len(longest)}')
-
-
-def find_paths(grid, passcode):
-    """Find paths in grid depending on hashing passcode."""
-    queue = deque([([(0, 0)], '')])
-    target = (3, 3)
-    paths = []
-    while queue:
-        positions, cur_path = queue.popleft()
-        cur_position = positions[-1]
-        if cur_position == target:
-            paths.append(cur_path)
-            continue
-        next_moves = get_next_moves(
-            grid, cur_position, get_hash(passcode, cur_path)[:4])
-        for move, direction in next_moves:
-            queue.append((positions + [move], cur_path + direction))
-    return paths
-
-
-def get_next_moves(grid, position, hash):
-    """Get moves from position in grid, depending on hash."""
-    moves = []
-    for move, hash_char in zip(MOVES, hash):
-        if not re.match(r'[b-f]', hash_char):
-            continue
-        row, col = position
-        (row_change, col_change), direction = move
-        next_row, next_col = row + row_change, col + col_change
-        if (not is_in_limit(next_row, len(grid))
-                or not is_in_limit(next_col, len(grid[0]))):
-            continue
-        moves.append(((next_row, next_col), direction))
-    return moves
-
-
-def is_in_limit(value, limit):
-    """Check if value is within limit."""
-    return 0 <= value < limit
-
-
-def get_hash(passcode, path):
-    """Get hash from passcode and path."""
-    return hashlib.md5((passcode + path).encode()).hexdigest()
-
-
-def get_grid(size):
-    """Create grid with size."""
-    return [[[] for _ in range(size)]
-            for _ in range(size)]
+    print(f'Length of the longest path: {longest}')
+
+
+def find_paths(passcode, size=4, processes=None):
+    """Find shortest path to the vault and length of the longest one.
+
+    With more than one of processes, paths are searched until frontier is
+    wide enough, then its chunks are searched in pool of that many
+    processes.
+    """
+    roots = [('', 0, 0)]
+    if not processes or processes == 1:
+        shortest, longest, _ = search(passcode, roots, size)
+        return shortest, longest
+    chunks_count = CHUNKS_PER_PROCESS * processes
+    shortest, longest, frontier = search(passcode, roots, size,
+                                         chunks_count)
+    if frontier is None:
+        return shortest, longest
+    chunk_size = -(-len(frontier) // chunks_count)
+    chunks = [frontier[start:start + chunk_size]
+              for start in range(0, len(frontier), chunk_size)]
+    with ProcessPoolExecutor(processes) as executor:
+        results = list(executor.map(
+            partial(search, passcode, size=size), chunks))
+    paths = [shortest] + [path for path, _, _ in results]
+    lengths = [longest] + [length for _, length, _ in results]
+    shortest = min((path for path in paths if path is not None),
+                   key=len, default=None)
+    longest = max((length for length in lengths if length is not None),
+                  default=None)
+    return shortest, longest
+
+
+def search(passcode, roots, size=4, limit=None):
+    """Search paths from roots to the vault, level by level.
+
+    Roots are (path, row, col), with paths of the same length. Frontier
+    nodes hold hash of passcode with their path, continued by every move.
+    Paths are kept as parent pointers, in array of parent nodes and bytes
+    of moves, with roots being the first nodes. Returns shortest path,
+    length of the longest one, and frontier as roots, when it gets wider
+    than limit, or None when all paths were searched.
+    """
+    primed = hashlib.md5(passcode.encode())
+    parents = array('i', [-1] * len(roots))
+    moves = bytearray(len(roots))
+    frontier = []
+    for node, (path, row, col) in enumerate(roots):
+        md5 = primed.copy()
+        md5.update(path.encode())
+        frontier.append((node, row, col, md5))
+    target = size - 1, size - 1
+    length = len(roots[0][0]) if roots else 0
+    shortest = None
+    longest = None
+    while frontier:
+        if limit is not None and len(frontier) > limit:
+            return shortest, longest, [
+                (get_path(roots, parents, moves, node), row, col)
+                for node, row, col, _ in frontier]
+        length += 1
+        digests = [md5.digest() for *_, md5 in frontier]
+        next_frontier = []
+        for (node, row, col, md5), digest in zip(frontier, digests):
+            doors = (digest[0] >> 4, digest[0] & 0xf,
+                     digest[1] >> 4, digest[1] & 0xf)
+            for move, door in enumerate(doors):
+                (row_change, col_change), step = MOVES[move]
+                next_row, next_col = row + row_change, col + col_change
+                if (door < OPEN
+                        or not 0 <= next_row < size
+                        or not 0 <= next_col < size):
+                    continue
+                if (next_row, next_col) == target:
+                    if shortest is None:
+                        shortest = (get_path(roots, parents, moves, node)
+                                    + step)
+                    longest = length
+                    continue
+                next_md5 = md5.copy()
+                next_md5.update(step.encode())
+                next_frontier.append(
+                    (len(parents), next_row, next_col, next_md5))
+                parents.append(node)
+                moves.append(move)
+        frontier = next_frontier
+    return shortest, longest, None
+
+
+def get_path(roots, parents, moves, node):
+    """Get path to node, following parent pointers up to one of roots."""
+    path = []
+    while node >= len(roots):
+        path.append(MOVES[moves[node]][1])
+        node = parents[node]
+    return roots[node][0] + ''.join(reversed(path))
 
 
 if __name__ == '__main__':
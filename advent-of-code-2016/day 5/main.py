@@ -1,29 +1,41 @@
 """Advent of Code 2016 Day 5."""
-import hashlib
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.hashing import find_hashes  # noqa: E402
 
 
 puzzle = 'ugkcyxxp'
 
 
 def main(puzzle=puzzle):
-    password = find_password(puzzle, next_empty)
+    password, password_not_in_order = find_passwords(
+        puzzle, [next_empty, without_order], processes=os.cpu_count())
     print(f'Password: {password}')
-    password_not_in_order = find_password(puzzle, without_order)
     print(f'Password found not in order: {password_not_in_order}')
 
 
-def find_password(door_id, decrypter):
-    """Find password for door_id, using decrypter function."""
-    password = [None] * 8
-    index = 0
-    while not all(password):
-        next_hash = hashlib.md5(f'{door_id}{index}'.encode()).hexdigest()
-        if next_hash.startswith('0' * 5):
+def find_passwords(door_id, decrypters, processes=None):
+    """Find passwords for door_id, one for each of decrypters functions.
+
+    Passwords are filled from the same hashes, found only once.
+    """
+    passwords = [[None] * 8 for _ in decrypters]
+    hashes = find_hashes(door_id, 5, processes=processes)
+    for _, digest in hashes:
+        next_hash = digest.hex()
+        for password, decrypter in zip(passwords, decrypters):
+            if all(password):
+                continue
             position, char = decrypter(password, next_hash)
             if is_position_valid(position, password):
                 password[position] = char
-        index += 1
-    return ''.join(password)
+        if all(all(password) for password in passwords):
+            break
+    hashes.close()
+    return [''.join(password) for password in passwords]
 
 
 def is_position_valid(position, password):
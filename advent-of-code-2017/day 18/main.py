@@ -1,9 +1,16 @@
 """Advent of Code 2017 Day 18."""
-from collections import defaultdict
+import os
+import sys
+from collections import defaultdict, deque
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.inputs import read_lines  # noqa: E402
+from aoc.vm import record  # noqa: E402
 
 
 def main(file_input='input.txt'):
-    lines = [line.strip() for line in get_file_contents(file_input)]
+    lines = read_lines(file_input)
     instructions = parse_instructions(lines)
     register = get_register()
     process_instructions(register, instructions)
@@ -13,29 +20,80 @@ def main(file_input='input.txt'):
 
 
 def run_programs(instructions):
-    """Run two programs sending and receiving from each other."""
-    register0 = get_register()
-    register0['p'] = 0
-    register1 = get_register()
-    register1['p'] = 1
-    registers = {0: register0, 1: register1}
-    cur_instructions = [0, 0]
-    while not is_deadlock(registers, cur_instructions, instructions):
-        for index, instruction in enumerate(cur_instructions):
-            name, params = instructions[instruction]
-            if name == 'rcv':
-                cur_instructions[index] = receive(
-                    registers[index],
-                    cur_instructions[index],
-                    *params,
-                    registers[(index + 1) % 2]
-                )
+    """Run two programs sending and receiving from each other.
+
+    Programs are generators, switched only when the running one blocks on
+    receiving from empty queue, or ends. Programs are in deadlock, when the
+    other one is blocked too, with its queue still empty.
+    """
+    queues = (deque(), deque())
+    registers = {}
+    programs = []
+    for program_id in (0, 1):
+        register = get_register()
+        register['p'] = program_id
+        registers[program_id] = register
+        inbox, outbox = queues[program_id], queues[1 - program_id]
+        programs.append(run_program(register, instructions, inbox, outbox))
+    waiting = [False, False]
+    finished = [False, False]
+    current = 0
+    while True:
+        waiting[current] = False
+        try:
+            next(programs[current])
+            waiting[current] = True
+        except StopIteration:
+            finished[current] = True
+        other = 1 - current
+        if finished[other] or (waiting[other] and not queues[other]):
+            return registers
+        current = other
+
+
+def run_program(register, instructions, inbox, outbox, profile=None):
+    """Run program as generator, yielding when receiving from empty inbox.
+
+    Sent values are appended to outbox, with their count in register.
+    Executed instructions are recorded in profile.
+    """
+    cur_instruction = 0
+    previous = None
+    while 0 <= cur_instruction < len(instructions):
+        name, params = instructions[cur_instruction]
+        if profile is not None:
+            record(profile, previous, cur_instruction, name)
+            previous = cur_instruction
+        if name == 'rcv':
+            while not inbox:
+                yield
+            register[params[0]] = inbox.popleft()
+        elif name == 'snd':
+            source, = params
+            outbox.append(
+                source if isinstance(source, int) else register[source])
+            register['counter'] += 1
+        elif name == 'jgz':
+            source, offset = params
+            value = source if isinstance(source, int) else register[source]
+            if value > 0:
+                cur_instruction += (
+                    offset if isinstance(offset, int) else register[offset])
+                continue
+        else:
+            target, source = params
+            value = source if isinstance(source, int) else register[source]
+            if name == 'set':
+                register[target] = value
+            elif name == 'add':
+                register[target] += value
+            elif name == 'mul':
+                register[target] *= value
+            elif name == 'mod':
+                register[target] %= value
             else:
-                func = get_func(name)
-                cur_instructions[index] = func(
-                    registers[index], cur_instructions[index], *params)
-            cur_instructions[index] += 1
-    return registers
+                raise ValueError(f'Unknown instruction {name}')
+        cur_instruction += 1
 
 
 def get_register():
@@ -45,25 +103,6 @@ def get_register():
     return register
 
 
-def is_deadlock(registers, cur_instructions, instructions):
-    """Check if programs are in deadlock."""
-    for index, cur_instruction in enumerate(cur_instructions):
-        if not (is_receiving(instructions[cur_instruction])
-                and is_queue_empty(registers[(index + 1) % 2])):
-            return False
-    return True
-
-
-def is_queue_empty(register):
-    """Check if send queue is empty."""
-    return len(register['sound']) == 0
-
-
-def is_receiving(instruction):
-    """Check if instruction is receiving."""
-    return instruction[0] == 'rcv'
-
-
 def process_instructions(register, instructions, registers=None):
     """Process instructions."""
     cur_instruction = 0
@@ -108,15 +147,6 @@ def remainder(register, cur_instruction, target, source):
     return cur_instruction
 
 
-def receive(register, cur_instruction, target, other_register):
-    """Receive instruction."""
-    try:
-        register[target] = other_register['sound'].pop(0)
-    except IndexError:
-        return cur_instruction - 1
-    return cur_instruction
-
-
 def recover(register, cur_instruction, source):
     """Recover instruction."""
     value = source if is_int(source) else register[source]
@@ -164,11 +194,5 @@ def parse_instruction(line):
                    for param in params])
 
 
-def get_file_contents(file):
-    """Read all lines from file."""
-    with open(file) as f:
-        return f.readlines()
-
-
 if __name__ == '__main__':
     main()
@@ -1,32 +1,47 @@
 """Advent of Code 2017 Day 23."""
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.inputs import read_lines  # noqa: E402
+from aoc.vm import record  # noqa: E402
+
+# Loops setting flag to 0 when number is composite, by checking products of
+# all d and e lower than number. Str operands are registers bound to names.
+COMPOSITE_CHECK = (
+    ('set', 'flag', 1),
+    ('set', 'd', 2),
+    ('set', 'e', 2),
+    ('set', 'product', 'd'),
+    ('mul', 'product', 'e'),
+    ('sub', 'product', 'number'),
+    ('jnz', 'product', 2),
+    ('set', 'flag', 0),
+    ('sub', 'e', -1),
+    ('set', 'product', 'e'),
+    ('sub', 'product', 'number'),
+    ('jnz', 'product', -8),
+    ('sub', 'd', -1),
+    ('set', 'product', 'd'),
+    ('sub', 'product', 'number'),
+    ('jnz', 'product', -13),
+)
 
 
 def main(file_input='input.txt'):
-    lines = [line.strip() for line in get_file_contents(file_input)]
+    lines = read_lines(file_input)
     instructions = parse_instructions(lines)
     register = {letter: 0 for letter in 'abcdefgh'}
     register = process_instructions(register, instructions)
     print(f'Times mul instruction executed: {multiply.counter}')
     register = {letter: 0 for letter in 'abcdefgh'}
     register['a'] = 1
-    h_value = process_stage_2(register)
+    register = process_instructions(register, instructions, optimize=True)
+    h_value = register['h']
     print(f'Value in register h after seeding register a with 1: {h_value}')
 
 
-def process_stage_2(register):
-    """Return register after processing stage 2."""
-    # After exploring https://www.reddit.com/r/adventofcode/comments/7lms6p/2017_day_23_solutions/drnmlbk/
-    b = 57 * 100 + 100_000
-    c = b + 17000
-    h = 0
-    for cur_num in range(b, c + 1, 17):
-        for d in range(2, cur_num):
-            if cur_num % d == 0:
-                h += 1
-                break
-    return h
-
-
 def count_wrapper(func):
     """Wrapper counting numbers of calls."""
     def wrap(*args, **kwargs):
@@ -36,10 +51,26 @@ def count_wrapper(func):
     return wrap
 
 
-def process_instructions(register, instructions, registers=None):
-    """Process instructions."""
+def process_instructions(register, instructions, optimize=False,
+                         profile=None):
+    """Process instructions.
+
+    With optimize, loops checking if number is composite are replaced by
+    lookup in the sieve. Executed instructions are recorded in profile.
+    """
+    checks = find_composite_checks(instructions) if optimize else {}
     cur_instruction = 0
+    previous = None
     while 0 <= cur_instruction < len(instructions):
+        if profile is not None:
+            record(profile, previous, cur_instruction,
+                   instructions[cur_instruction][0])
+            previous = cur_instruction
+        if cur_instruction in checks:
+            end, names = checks[cur_instruction]
+            if check_composite(register, **names):
+                cur_instruction = end
+                continue
         name, params = instructions[cur_instruction]
         func = get_func(name)
         cur_instruction = func(register, cur_instruction, *params)
@@ -47,6 +78,81 @@ def process_instructions(register, instructions, registers=None):
     return register
 
 
+def find_composite_checks(instructions):
+    """Find loops checking if number is composite in instructions.
+
+    Returns mapping of loop start to the index after it and registers
+    bound to names of COMPOSITE_CHECK.
+    """
+    checks = {}
+    size = len(COMPOSITE_CHECK)
+    for start in range(len(instructions) - size + 1):
+        names = match(COMPOSITE_CHECK, instructions[start:start + size])
+        if names is not None:
+            checks[start] = start + size, names
+    return checks
+
+
+def match(pattern, instructions):
+    """Match pattern with instructions, binding registers to names.
+
+    Returns bound registers, different for every name, or None.
+    """
+    names = {}
+    for (name, *operands), (instruction_name, params) in zip(
+            pattern, instructions):
+        if name != instruction_name or len(operands) != len(params):
+            return None
+        for operand, param in zip(operands, params):
+            if is_int(operand) or is_int(param):
+                if operand != param:
+                    return None
+            elif operand in names:
+                if names[operand] != param:
+                    return None
+            elif param in names.values():
+                return None
+            else:
+                names[operand] = param
+    return names
+
+
+def check_composite(register, flag, d, e, product, number):
+    """Set registers as after loops checking if number is composite.
+
+    Returns False, without changes, when loops would not end for number.
+    """
+    value = register[number]
+    if value < 3:
+        return False
+    register[flag] = 0 if is_composite(value) else 1
+    register[d] = register[e] = value
+    register[product] = 0
+    return True
+
+
+def is_composite(number):
+    """Check if number is composite, using sieve growing as needed."""
+    if number >= len(is_composite.sieve):
+        is_composite.sieve = get_sieve(max(number + 1,
+                                           2 * len(is_composite.sieve)))
+    return not is_composite.sieve[number]
+
+
+def get_sieve(limit):
+    """Get sieve of Eratosthenes, with 1 for primes lower than limit."""
+    sieve = bytearray([1]) * limit
+    sieve[:2] = bytes(min(2, limit))
+    for number in range(2, int(limit ** 0.5) + 1):
+        if sieve[number]:
+            sieve[number * number::number] = bytes(
+                len(range(number * number, limit, number)))
+    return sieve
+
+
+is_composite.sieve = get_sieve(2)
+
+
 def get_func(name):
     """Instruction name to function mapping."""
     return {
@@ -107,11 +213,5 @@ def parse_instruction(line):
                    for param in params])
 
 
-def get_file_contents(file):
-    """Read all lines from file."""
-    with open(file) as f:
-        return f.readlines()
-
-
 if __name__ == '__main__':
     main()
@@ -1,13 +1,28 @@
 """Advent of Code 2017 Day 8."""
+import os
+import sys
 from collections import defaultdict
 
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.codegen import compile_function, get_local_names  # noqa: E402
+from aoc.inputs import read_lines  # noqa: E402
+
+CHECKS = {
+    '>': int.__gt__,
+    '<': int.__lt__,
+    '>=': int.__ge__,
+    '==': int.__eq__,
+    '<=': int.__le__,
+    '!=': int.__ne__,
+}
+
 
 def main(file_input='input.txt'):
-    lines = [line.strip() for line in get_file_contents(file_input)]
+    lines = read_lines(file_input)
     instructions = parse_instructions(lines)
-    register = defaultdict(int)
     processed_register, moment_max = process_instructions(
-        register.copy(), instructions)
+        defaultdict(int), instructions)
     maximum = get_max_value(processed_register)
     print(f'Highest value in register at the end: {maximum}')
     print(f'Highest value held at any point: {moment_max}')
@@ -26,6 +41,40 @@ def process_instructions(register, instructions):
     return register, intermediate_max
 
 
+def compile_instructions(instructions):
+    """Compile instructions to function processing register.
+
+    Function returns register and highest value held in it, like
+    process_instructions does, with every register of instructions
+    starting at 0, unless set in passed register. Compiling takes much
+    longer than processing instructions once, so it pays off only for
+    function run many times, or loaded from cache of codegen.
+    """
+    names = get_local_names(
+        {name for (name, _, _), _ in instructions}
+        | {name for _, (name, _, _) in instructions})
+    symbols = {function: symbol for symbol, function in CHECKS.items()}
+    body = [f"{local} = register.get('{name}', 0)"
+            for name, local in names.items()]
+    body.append('intermediate_max = 0')
+    for (name, modify, value), condition in instructions:
+        check_name, check_function, check_value = condition
+        local = names[name]
+        sign = '+' if modify is increase else '-'
+        body.extend([
+            f'if {names[check_name]} {symbols[check_function]} '
+            f'{check_value}:',
+            f'    {local} {sign}= {value}',
+            f'    if {local} > intermediate_max:',
+            f'        intermediate_max = {local}',
+        ])
+    body.append(
+        'return {'
+        + ', '.join(f"'{name}': {local}" for name, local in names.items())
+        + '}, intermediate_max')
+    return compile_function('program', ['register'], body)
+
+
 def get_max_value(register):
     """Get maximum value from register."""
     return max(register.values())
@@ -41,14 +90,7 @@ def get_action_function(action):
 
 def get_check_function(check):
     """Return check function corresponding to check."""
-    return {
-        '>': int.__gt__,
-        '<': int.__lt__,
-        '>=': int.__ge__,
-        '==': int.__eq__,
-        '<=': int.__le__,
-        '!=': int.__ne__,
-    }[check]
+    return CHECKS[check]
 
 
 def increase(register, name, value):
@@ -84,11 +126,5 @@ def parse_modifier(modifier):
         modifier, (lambda x: x, get_action_function, int))]
 
 
-def get_file_contents(file):
-    """Read all lines from file."""
-    with open(file) as f:
-        return f.readlines()
-
-
 if __name__ == '__main__':
     main()
@@ -1,11 +1,17 @@
 """Advent of Code 2018 Day 16."""
 from collections import defaultdict
-import operator
+import os
 import re
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.elfcode import OPERATIONS, decode, decode_instruction  # noqa: E402
+from aoc.inputs import read_text  # noqa: E402
 
 
 def main(file_input='input.txt'):
-    sample_lines, program_lines = get_file_contents(file_input).split('\n\n\n')
+    sample_lines, program_lines = read_text(file_input).split('\n\n\n')
     possible_ops = get_possible_ops(parse_samples(sample_lines))
 
     three_or_more_ops = [
@@ -21,9 +27,10 @@ def main(file_input='input.txt'):
 def execute(op_codes, program):
     """Execute program on based on op_codes op_code -> operation mapping."""
     registers = [0 for _ in range(4)]
-    for instruction in program:
-        op_code, *values = instruction
-        registers = caller(op_codes[op_code], registers, values)
+    named_program = [(op_codes[op_code], *values)
+                     for op_code, *values in program]
+    for operation in decode(named_program, registers):
+        operation()
     return registers
 
 
@@ -64,94 +71,15 @@ def get_possible_ops(samples):
         cur_ops = set()
         instruction, before, after = sample
         op_code, *registers = instruction
-        for operation in get_operations():
-            result = caller(operation, before[:], registers)
+        for operation in OPERATIONS:
+            result = before[:]
+            decode_instruction(result, operation, *registers)()
             if result == after:
                 cur_ops.add(operation)
         ops.append((cur_ops, instruction[0]))
     return ops
 
 
-def caller(operation, registers, params):
-    """Call function based on operation on registers and parameters."""
-    operations = get_call_operations()
-    func, get_params, *rest = operations[operation]
-    return func(registers, *get_params(registers, params), *rest)
-
-
-def register_param(registers, params):
-    """Return from registers register parameters."""
-    return registers[params[0]], registers[params[1]], params[2]
-
-
-def immediate_param(registers, params):
-    """Return from registers immediate parameters."""
-    return registers[params[0]], params[1], params[2]
-
-
-def compare_ir_param(registers, params):
-    """Return From registers immediate/register parameters for compare."""
-    return params[0], registers[params[1]], params[2]
-
-
-def compare_ri_param(registers, params):
-    """Return from registers register/immediate parameters for compare."""
-    return registers[params[0]], params[1], params[2]
-
-
-def compare_rr_param(registers, params):
-    """Return from registers register parameters for compare action."""
-    return registers[params[0]], registers[params[1]], params[2]
-
-
-def change_action(registers, num_a, num_b, reg_c, operation):
-    """Perform change action using operation on num_a and num_b."""
-    registers[reg_c] = operation(num_a, num_b)
-    return registers
-
-
-def set_action(registers, num_a, _, reg_c):
-    """Perform assign action of num_a to reg_c in registers."""
-    registers[reg_c] = num_a
-    return registers
-
-
-def compare_action(registers, num_a, num_b, reg_c, operation):
-    """Perform compare action of operation on num_a and num_b."""
-    registers[reg_c] = 1 if operation(num_a, num_b) else 0
-    return registers
-
-
-def get_operations():
-    """Get possible operations."""
-    return (
-        'addr', 'addi', 'mulr', 'muli', 'banr', 'bani', 'borr', 'bori',
-        'setr', 'seti', 'gtir', 'gtri', 'gtrr', 'eqir', 'eqri', 'eqrr'
-    )
-
-
-def get_call_operations():
-    """Get operations to operation parameters mapping for caller."""
-    return {
-        'addr': (change_action, register_param, operator.add),
-        'addi': (change_action, immediate_param, operator.add),
-        'mulr': (change_action, register_param, operator.mul),
-        'muli': (change_action, immediate_param, operator.mul),
-        'banr': (change_action, register_param, operator.and_),
-        'bani': (change_action, immediate_param, operator.and_),
-        'borr': (change_action, register_param, operator.or_),
-        'bori': (change_action, immediate_param, operator.or_),
-        'setr': (set_action, register_param),
-        'seti': (set_action, lambda register, params: params),
-        'gtir': (compare_action, compare_ir_param, operator.gt),
-        'gtri': (compare_action, compare_ri_param, operator.gt),
-        'gtrr': (compare_action, compare_rr_param, operator.gt),
-        'eqir': (compare_action, compare_ir_param, operator.eq),
-        'eqri': (compare_action, compare_ri_param, operator.eq),
-        'eqrr': (compare_action, compare_rr_param, operator.eq),
-    }
-
-
 def parse_program(lines):
     """Parse program from lines."""
     return [[int(num) for num in line.strip().split()]
@@ -171,11 +99,5 @@ def parse_samples(lines):
     return samples
 
 
-def get_file_contents(file):
-    """Read all lines from file."""
-    with open(file) as f:
-        return f.read()
-
-
 if __name__ == '__main__':
     main()
@@ -1,6 +1,12 @@
 """Advent of Code 2018 Day 17."""
 from collections import deque
+import os
 import re
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.inputs import load_cached  # noqa: E402
 
 
 CLAY = '#'
@@ -11,8 +17,7 @@ SPRING = '+'
 
 
 def main(file_input='input.txt'):
-    lines = [line.strip() for line in get_file_contents(file_input)]
-    clays = parse_clays(lines)
+    clays = load_cached(parse_clays, file_input)
     boundaries = get_boundaries(clays)
     bound_x, bound_y = boundaries
     adjusted_clays = adjust_clays(clays, bound_x[0], bound_y[0])
@@ -225,11 +230,5 @@ def parse_clay(line):
     return (axis, [int(num) for num in nums])
 
 
-def get_file_contents(file):
-    """Read all lines from file."""
-    with open(file) as f:
-        return f.readlines()
-
-
 if __name__ == '__main__':
     main()
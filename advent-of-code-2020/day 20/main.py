@@ -3,7 +3,13 @@
 Created on Sun Dec 20 10:51:07 2020
 """
 from collections import defaultdict, deque
+import os
 import re
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.inputs import load_cached, read_blocks  # noqa: E402
 
 
 NEIGH = {
@@ -22,9 +28,8 @@ EDGE_TO_NEIGHBOUR = {
 
 
 def main():
-    input_squares = get_file_contents().split('\n\n')
     squares, square_to_edges, edge_to_squares = process_squares(
-        parse_squares(input_squares)
+        load_cached(parse_squares, reader=read_blocks)
     )
 
     corners = get_corners(square_to_edges, edge_to_squares)
@@ -414,11 +419,5 @@ def parse_squares(input_squares):
     return squares
 
 
-def get_file_contents(file='input.txt'):
-    """Read all lines from file."""
-    with open(file) as f:
-        return f.read()
-
-
 if __name__ == '__main__':
     main()
@@ -2,9 +2,31 @@
 """
 Created on Wed Dec 23 09:35:44 2020
 """
+import os
+import sys
+from array import array
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.codegen import compile_function  # noqa: E402
 
 puzzle_input = '538914762'
 example = '389125467'
+CHUNK_SIZE = 16
+MOVE_LINES = (
+    'first = successors[current]',
+    'second = successors[first]',
+    'third = successors[second]',
+    'successors[current] = successors[third]',
+    'destination = current - 1 or highest',
+    'while (destination == first',
+    '       or destination == second',
+    '       or destination == third):',
+    '    destination = destination - 1 or highest',
+    'successors[third] = successors[destination]',
+    'successors[destination] = first',
+    'current = successors[current]',
+)
 
 
 def main():
@@ -19,8 +41,53 @@ def main():
     print(f'Multiplied: {star * star2}')
 
 
-def play_cups(puzzle, moves_num):
-    """Play moves_num number of rounds, with puzzle."""
+def play_cups(puzzle, moves_num, chunk_size=None):
+    """Play moves_num number of rounds, with puzzle.
+
+    Puzzle is table of successors of every cup, with the current cup at 0.
+    With chunk_size, like CHUNK_SIZE, moves are played in chunks of that
+    many, by kernel with the move repeated chunk_size times in its loop.
+    """
+    if chunk_size and chunk_size > 1:
+        chunks, moves_num = divmod(moves_num, chunk_size)
+        get_kernel(chunk_size)(puzzle, chunks)
+    return play_moves(puzzle, moves_num)
+
+
+def play_moves(successors, moves_num):
+    """Play moves_num moves on table of successors, allocating nothing."""
+    highest = len(successors) - 1
+    current = successors[0]
+    for _ in range(moves_num):
+        first = successors[current]
+        second = successors[first]
+        third = successors[second]
+        successors[current] = successors[third]
+        destination = current - 1 or highest
+        while (destination == first
+               or destination == second
+               or destination == third):
+            destination = destination - 1 or highest
+        successors[third] = successors[destination]
+        successors[destination] = first
+        current = successors[current]
+    successors[0] = current
+    return successors
+
+
+def get_kernel(chunk_size):
+    """Get function playing chunks of chunk_size moves on successors."""
+    body = ['highest = len(successors) - 1',
+            'current = successors[0]',
+            'for _ in range(chunks):']
+    for _ in range(chunk_size):
+        body.extend(f'    {line}' for line in MOVE_LINES)
+    body.append('successors[0] = current')
+    return compile_function('play_chunks', ['successors', 'chunks'], body)
+
+
+def play_cups_by_move(puzzle, moves_num):
+    """Play moves_num number of rounds with puzzle, calling move for each."""
     start = puzzle[0]
     puzzle_size = len(puzzle)
     for round_no in range(moves_num):
@@ -58,15 +125,18 @@ def result(puzzle):
 
 
 def parse_puzzle(puzzle, maximum=10**6):
-    """Parse input puzzle, with maximum number of numbers in puzzle."""
-    parsed_puzzle = [None for _ in range(maximum + 1)]
+    """Parse input puzzle, with maximum number of numbers in puzzle.
+
+    Returns array of successors of every cup, with the first cup at 0.
+    """
     initial_puzzle = parse_numbers(puzzle)
+    parsed_puzzle = array('I', range(1, maximum + 2))
     for prev_index, number in enumerate(initial_puzzle[1:]):
         parsed_puzzle[initial_puzzle[prev_index]] = number
     last_number = initial_puzzle[-1]
-    for number in range(max(initial_puzzle) + 1, maximum + 1):
-        parsed_puzzle[last_number] = number
-        last_number = number
+    if maximum > max(initial_puzzle):
+        parsed_puzzle[last_number] = max(initial_puzzle) + 1
+        last_number = maximum
     parsed_puzzle[last_number] = initial_puzzle[0]
     parsed_puzzle[0] = initial_puzzle[0]
     return parsed_puzzle
@@ -2,58 +2,124 @@
 """
 Created on Tue Dec  8 18:35:54 2020
 """
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from aoc.inputs import read_lines  # noqa: E402
+from aoc.vm import record  # noqa: E402
+
+FLIPS = {
+    'jmp': 'nop',
+    'nop': 'jmp',
+}
 
 
 def main():
-    instructions = [line.strip() for line in get_file_contents()]
-    for index, line in enumerate(instructions):
-        starts_with_jmp = line.startswith('jmp')
-        starts_with_nop = line.startswith('nop')
-        if not any((starts_with_jmp, starts_with_nop)):
+    instructions = parse_instructions(read_lines())
+    index, accumulator = find_repair(instructions)
+    print(f'End encountered, accumulator: {accumulator}')
+    print(f'Changed line: {index}')
+
+
+def find_repair(instructions):
+    """Find jmp or nop, which flipped makes instructions terminate.
+
+    Indices reaching termination are found once, walking backwards from
+    the end. Then single walk from line 0 finds the first instruction,
+    which flipped leads to one of them. Returns (index, accumulator after
+    termination), or None when no flip repairs instructions.
+    """
+    terminating = get_terminating(instructions)
+    line = 0
+    visited = set()
+    while line not in visited and 0 <= line < len(instructions):
+        visited.add(line)
+        operation, argument = instructions[line]
+        if operation in FLIPS:
+            flipped_line = get_next_line(FLIPS[operation], argument, line)
+            if (flipped_line in terminating
+                    or not 0 <= flipped_line < len(instructions)):
+                repaired = instructions[:]
+                repaired[line] = FLIPS[operation], argument
+                return line, process_instructions(repaired)
+        line = get_next_line(operation, argument, line)
+    return None
+
+
+def find_repair_by_trial(instructions):
+    """Find flip repairing instructions, by running every flipped copy."""
+    for index, (operation, argument) in enumerate(instructions):
+        if operation not in FLIPS:
             continue
-        new_instructions = instructions[:]
+        repaired = instructions[:]
+        repaired[index] = FLIPS[operation], argument
+        accumulator = process_instructions(repaired)
+        if accumulator is not None:
+            return index, accumulator
+    return None
+
 
-        if starts_with_jmp:
-            new_instructions[index] = line.replace('jmp', 'nop')
-        elif starts_with_nop:
-            new_instructions[index] = line.replace('nop', 'jmp')
+def get_terminating(instructions):
+    """Get set of indices, from which instructions terminate."""
+    size = len(instructions)
+    previous_lines = [[] for _ in range(size)]
+    to_check = []
+    for line, (operation, argument) in enumerate(instructions):
+        next_line = get_next_line(operation, argument, line)
+        if 0 <= next_line < size:
+            previous_lines[next_line].append(line)
+        else:
+            to_check.append(line)
+    terminating = set(to_check)
+    while to_check:
+        line = to_check.pop()
+        for previous_line in previous_lines[line]:
+            if previous_line not in terminating:
+                terminating.add(previous_line)
+                to_check.append(previous_line)
+    return terminating
 
-        if process_instructions(new_instructions) is not None:
-            print(f'Changed line: {index}')
-            break
 
+def process_instructions(instructions, profile=None):
+    """Process instructions in order, starting from line 0.
 
-def process_instructions(instructions):
-    """Process instructions in order, starting from line 0"""
+    Returns accumulator after termination, or None if line is repeated.
+    Executed instructions are recorded in profile.
+    """
     line = 0
     instructions_executed = set()
     accumulator = 0
-    while line not in instructions_executed:
-        try:
-            instruction = instructions[line]
-        except IndexError:
-            print(f'End encountered, accumulator: {accumulator}')
-            return accumulator
+    previous = None
+    while 0 <= line < len(instructions):
+        if line in instructions_executed:
+            return None
         instructions_executed.add(line)
-        line, accumulator = process_instruction(instruction, line, accumulator)
-    return None
+        operation, argument = instructions[line]
+        if profile is not None:
+            record(profile, previous, line, operation)
+            previous = line
+        if operation == 'acc':
+            accumulator += argument
+        line = get_next_line(operation, argument, line)
+    return accumulator
 
 
-def process_instruction(instruction, line, accumulator):
-    """Process operation from single instruction."""
-    operations = {
-        'nop': lambda l, diff: (line + 1, accumulator),
-        'acc': lambda l, diff: (line + 1, accumulator + diff),
-        'jmp': lambda l, diff: (line + diff, accumulator),
-    }
-    operation, operation_diff = instruction.split()
-    return operations[operation](line, int(operation_diff))
+def get_next_line(operation, argument, line):
+    """Get line executed after operation with argument at line."""
+    if operation == 'jmp':
+        return line + argument
+    return line + 1
 
 
-def get_file_contents(file="input.txt"):
-    """Read all lines from file."""
-    with open(file) as f:
-        return f.readlines()
+def parse_instructions(lines):
+    """Parse lines to list of (operation, argument) tuples."""
+    instructions = []
+    for line in lines:
+        operation, argument = line.split()
+        instructions.append((operation, int(argument)))
+    return instructions
 
 
 if __name__ == '__main__':
@@ -0,0 +1,2 @@
+"""Shared helpers for Advent of Code solutions."""
+from aoc import days  # noqa: F401
@@ -0,0 +1,73 @@
+"""Command line interface of the Advent of Code helpers.
+
+Run days of years, writing JSON report with timing of each answer:
+
+    python -m aoc run 2019 --days 1-25 --output report.json
+
+Run all years in parallel, longest days by previous report first:
+
+    python -m aoc run --jobs 8 --timings report.json --output report.json
+
+Benchmark hot functions of the days against recorded baseline:
+
+    python -m aoc bench --threshold 0.25
+"""
+import argparse
+import sys
+
+from aoc import runner
+from aoc.benchmarks import suite
+from aoc.days import get_years
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m aoc')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser(
+        'run', help='run solutions and report their answers and timing')
+    run_parser.add_argument(
+        'years', nargs='*', type=int,
+        help='years to run, all years by default')
+    run_parser.add_argument(
+        '--days', help='days to run, like 1-5,7, all days by default')
+    run_parser.add_argument(
+        '--timeout', type=float, help='timeout for single day in seconds')
+    run_parser.add_argument(
+        '--output', help='path of JSON report, printed by default')
+    run_parser.add_argument(
+        '--jobs', type=int, default=1,
+        help='number of days run in parallel, 0 for number of CPUs')
+    run_parser.add_argument(
+        '--timings',
+        help='path of previous JSON report, to start longest days first')
+
+    bench_parser = commands.add_parser(
+        'bench', help='benchmark hot functions against recorded baseline')
+    bench_parser.add_argument(
+        'names', nargs='*',
+        help='prefixes of benchmark names, like 2016 or 2018-09')
+    bench_parser.add_argument(
+        '--repeat', type=int, default=5, help='number of timed runs')
+    bench_parser.add_argument(
+        '--threshold', type=float, default=suite.THRESHOLD,
+        help='allowed slowdown against baseline, like 0.25 for 25%%')
+    bench_parser.add_argument(
+        '--update', action='store_true',
+        help='record measured timings as new baseline')
+    bench_parser.add_argument(
+        '--baseline', default=suite.BASELINE, help='path of baseline JSON')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        runner.run(args.years or get_years(), args.days, args.timeout,
+                   args.output, args.jobs or None, args.timings)
+    elif args.command == 'bench':
+        regressions = suite.run(args.names, args.repeat, args.threshold,
+                                args.update, args.baseline)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+"""Assembunny interpreter shared by the Advent of Code 2016 solutions.
+
+Parsed instructions are compiled to bytecode: int opcodes with operands
+being indexes of slots. First four slots are registers a to d, the rest
+are constants of the program, so registers and immediates are read the
+same way, without any checks. Writes to constant slots, possible only
+after tgl, are skipped as invalid instructions.
+
+Before running, program is optimized by peephole pattern matching. Loops
+adding one register to another, and nested loops multiplying them, are
+replaced by synthetic add and mul instructions, placed at the first
+instruction of the loop and jumping past its end. Other instructions are
+left in place, so jumps and toggles keep their offsets. Optimization is
+repeated after every tgl, which can create or break such loops.
+
+Synthetic instruction falls back to the original instruction, when its
+counters would not end the loop, like when they are not positive. With
+OPTIMIZE turned off, every instruction is interpreted, and profile of the
+run shows the loops, which would be replaced.
+"""
+from collections import namedtuple
+
+from aoc.vm import record
+
+CPY = 0
+INC = 1
+DEC = 2
+JNZ = 3
+TGL = 4
+OUT = 5
+ADD = 6
+MUL = 7
+
+OPCODES = {
+    'cpy': CPY,
+    'inc': INC,
+    'dec': DEC,
+    'jnz': JNZ,
+    'tgl': TGL,
+    'out': OUT,
+}
+NAMES = {opcode: name for name, opcode in OPCODES.items()}
+TOGGLES = {
+    INC: DEC,
+    DEC: INC,
+    TGL: INC,
+    OUT: INC,
+    JNZ: CPY,
+    CPY: JNZ,
+}
+STEPS = {
+    INC: 1,
+    DEC: -1,
+}
+REGISTERS = 'abcd'
+OPTIMIZE = True
+
+Program = namedtuple('Program', 'opcodes operands constants')
+
+
+def parse_instructions(lines):
+    """Parse lines to list of instructions."""
+    return [parse_instruction(line)
+            for line in lines]
+
+
+def parse_instruction(line):
+    """Parse line to instruction."""
+    return [part if part.isalpha() else int(part)
+            for part in line.split()]
+
+
+def parse_program(lines):
+    """Parse lines to compiled Program."""
+    return compile_instructions(parse_instructions(lines))
+
+
+def get_empty_register():
+    """Create empty register."""
+    return {'a': 0, 'b': 0, 'c': 0, 'd': 0}
+
+
+def compile_instructions(instructions):
+    """Compile parsed instructions to Program bytecode.
+
+    Operands are pairs of slot indexes, with 0 for the missing second one.
+    """
+    constants = []
+    slots = {register: slot for slot, register in enumerate(REGISTERS)}
+    opcodes = []
+    operands = []
+    for name, *params in instructions:
+        indexes = []
+        for param in params:
+            if param not in slots:
+                slots[param] = len(REGISTERS) + len(constants)
+                constants.append(param)
+            indexes.append(slots[param])
+        opcodes.append(OPCODES[name])
+        operands.append((*indexes, 0)[:2])
+    return Program(opcodes, operands, tuple(constants))
+
+
+def get_slots(program, register):
+    """Get slots of program, with registers set from register dict."""
+    return [register[name] for name in REGISTERS] + list(program.constants)
+
+
+def get_register(slots):
+    """Get register dict from registers in slots."""
+    return dict(zip(REGISTERS, slots))
+
+
+def run(register, program, profile=None):
+    """Run compiled program on copy of register, returning the copy."""
+    slots = get_slots(program, register)
+    for _ in execute(program, slots, profile):
+        pass
+    return get_register(slots)
+
+
+def execute(program, slots, profile=None, opcodes=None):
+    """Execute compiled program on slots.
+
+    Yields (index, value) of every out instruction. Toggles change opcodes,
+    by default copied from program, so passed program is not changed.
+    Executed instructions, with synthetic ones recorded as the first
+    instruction of their loop, are recorded in profile.
+    """
+    if opcodes is None:
+        opcodes = program.opcodes[:]
+    operands = program.operands
+    fused = optimize(program, opcodes)
+    size = len(opcodes)
+    index = 0
+    previous = None
+    while 0 <= index < size:
+        if profile is not None:
+            record(profile, previous, index, NAMES[opcodes[index]])
+            previous = index
+        fusion = fused[index]
+        if fusion is not None:
+            if fusion[0] == MUL:
+                _, source, counter, outer, target, step = fusion
+                if slots[source] > 0 and slots[outer] > 0:
+                    slots[target] += step * slots[source] * slots[outer]
+                    slots[counter] = 0
+                    slots[outer] = 0
+                    index += 6
+                    continue
+            else:
+                _, counter, target, step = fusion
+                if slots[counter] > 0:
+                    slots[target] += step * slots[counter]
+                    slots[counter] = 0
+                    index += 3
+                    continue
+
+        opcode = opcodes[index]
+        first, second = operands[index]
+        if opcode == JNZ:
+            if slots[first]:
+                index += slots[second]
+                continue
+        elif opcode == CPY:
+            if second < 4:
+                slots[second] = slots[first]
+        elif opcode == INC:
+            if first < 4:
+                slots[first] += 1
+        elif opcode == DEC:
+            if first < 4:
+                slots[first] -= 1
+        elif opcode == OUT:
+            yield index, slots[first]
+        elif opcode == TGL:
+            target_index = index + slots[first]
+            if 0 <= target_index < size:
+                opcodes[target_index] = TOGGLES[opcodes[target_index]]
+                fused = optimize(program, opcodes)
+        index += 1
+
+
+def optimize(program, opcodes):
+    """Get synthetic instruction for every index, None if not replaced.
+
+    Synthetic add and mul instructions replace loops starting at index.
+    """
+    if not OPTIMIZE:
+        return [None] * len(opcodes)
+    return [match_mul(program, opcodes, index)
+            or match_add(program, opcodes, index)
+            for index in range(len(opcodes))]
+
+
+def match_add(program, opcodes, index):
+    """Match loop adding counter register to target at index.
+
+    Matches inc or dec of target and dec of counter, in any order, followed
+    by jnz counter -2. Returns (ADD, counter, target, step) or None.
+    """
+    if index + 3 > len(opcodes) or opcodes[index + 2] != JNZ:
+        return None
+    counter, jump_by = program.operands[index + 2]
+    if counter >= 4 or not is_constant(program, jump_by, -2):
+        return None
+    loop = list(zip(opcodes[index:index + 2],
+                    program.operands[index:index + 2]))
+    for (change, (target, _)), decrement in (loop, loop[::-1]):
+        if (decrement == (DEC, (counter, 0))
+                and change in STEPS
+                and target < 4
+                and target != counter):
+            return ADD, counter, target, STEPS[change]
+    return None
+
+
+def match_mul(program, opcodes, index):
+    """Match nested loops adding product of source and outer register.
+
+    Matches cpy source counter, add loop of counter to target, dec outer
+    and jnz outer -5. Returns (MUL, source, counter, outer, target, step)
+    or None.
+    """
+    if index + 6 > len(opcodes) or opcodes[index] != CPY:
+        return None
+    source, counter = program.operands[index]
+    addition = match_add(program, opcodes, index + 1)
+    if addition is None or addition[1] != counter:
+        return None
+    _, _, target, step = addition
+    outer, _ = program.operands[index + 4]
+    check, jump_by = program.operands[index + 5]
+    if (opcodes[index + 4] != DEC
+            or opcodes[index + 5] != JNZ
+            or check != outer
+            or not is_constant(program, jump_by, -5)):
+        return None
+    registers = {counter, outer, target}
+    if outer >= 4 or len(registers) != 3 or source in registers:
+        return None
+    return MUL, source, counter, outer, target, step
+
+
+def is_constant(program, slot, value):
+    """Check if slot of program holds constant value."""
+    return slot >= 4 and program.constants[slot - 4] == value
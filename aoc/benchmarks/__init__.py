@@ -0,0 +1 @@
+"""Benchmarks of the shared Advent of Code helpers."""
@@ -0,0 +1,58 @@
+"""Benchmark of interpreted and optimized assembunny bytecode.
+
+Compares runs with and without replacing add and mul loops on the 2016
+day 12 program seeded with c = 1, and on the day 25 search for the lowest
+clock signal seed. Run from the repository root with:
+
+    python -m aoc.benchmarks.assembunny
+"""
+import timeit
+
+from aoc import assembunny
+from aoc.days import get_day_path, load_day
+from aoc.inputs import read_lines
+
+
+def main(repeat=3):
+    workloads = (
+        ('Day 12 seeded with c = 1', 12, seeded_run),
+        ('Day 25 lowest clock seed', 25, clock_search),
+    )
+    for description, day, workload in workloads:
+        module = load_day(2016, day)
+        program = assembunny.parse_program(
+            read_lines(get_day_path(2016, day, 'input.txt')))
+        interpreted, optimized = [
+            time_workload(workload, module, program, optimize, repeat)
+            for optimize in (False, True)]
+        print(f'{description}:')
+        print(f'  Interpreted: {interpreted * 1000:.1f} ms')
+        print(f'  Optimized: {optimized * 1000:.1f} ms')
+        print(f'  Speedup: {interpreted / optimized:.2f}x')
+
+
+def seeded_run(_, program):
+    """Run day 12 program with register c seeded with 1."""
+    register = assembunny.get_empty_register()
+    register['c'] = 1
+    assembunny.run(register, program)
+
+
+def clock_search(module, program):
+    """Find lowest seed of day 25 program transmitting clock signal."""
+    module.find_lowest_seed(program)
+
+
+def time_workload(workload, module, program, optimize, repeat):
+    """Get best time of workload runs, with optimize toggled."""
+    previous_optimize = assembunny.OPTIMIZE
+    assembunny.OPTIMIZE = optimize
+    try:
+        timer = timeit.Timer(lambda: workload(module, program))
+        return min(timer.repeat(repeat=repeat, number=1))
+    finally:
+        assembunny.OPTIMIZE = previous_optimize
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Benchmark of the 2020 day 23 cups game, in moves per second.
+
+Plays moves on a million cups with the table of successors as list of int
+objects, moved by a function call per move, as the day did before, then
+as array('I') with the allocation-free loop, and with the chunked kernel.
+Memory taken by every table is traced too. Run from the repository root
+with:
+
+    python -m aoc.benchmarks.cups
+"""
+import time
+import tracemalloc
+
+from aoc.days import load_day
+
+
+def main(moves=2 * 10**6, cups=10**6):
+    module = load_day(2020, 23)
+    layouts = (
+        ('List, move per call', lambda: list(
+            module.parse_puzzle(module.puzzle_input, cups)),
+         module.play_cups_by_move),
+        ('Array', lambda: module.parse_puzzle(module.puzzle_input, cups),
+         module.play_cups),
+        (f'Array, kernel of {module.CHUNK_SIZE} moves',
+         lambda: module.parse_puzzle(module.puzzle_input, cups),
+         lambda table, moves: module.play_cups(
+             table, moves, module.CHUNK_SIZE)),
+    )
+    module.get_kernel(module.CHUNK_SIZE)
+    for description, parse, play in layouts:
+        tracemalloc.start()
+        table = parse()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        start = time.process_time()
+        play(table, moves)
+        elapsed = time.process_time() - start
+        print(f'{description}: {moves / elapsed:,.0f} moves per second, '
+              f'table of {size / 2**20:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
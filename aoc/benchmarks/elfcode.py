@@ -0,0 +1,71 @@
+"""Benchmark of decoded Elfcode execution, in instructions per second.
+
+Runs the 2018 day 19 program with register 0 starting at 0, and the day 21
+program until its halting check, without summarized loops. Then times day
+19 with register 0 starting at 1, and search for the last day 21 halting
+value, with loops summarized. Run from the repository root with:
+
+    python -m aoc.benchmarks.elfcode
+"""
+import time
+import timeit
+
+from aoc import elfcode
+from aoc.days import get_day_path, load_day
+from aoc.inputs import read_lines
+
+
+def main(repeat=3):
+    workloads = (
+        ('Day 19 background process', 19, frozenset()),
+        ('Day 21 until halting check', 21, frozenset({28})),
+    )
+    for description, day, breakpoints in workloads:
+        pointer_line, *lines = read_lines(get_day_path(2018, day, 'input.txt'))
+        program = elfcode.parse_program(lines)
+        pointer_register = elfcode.parse_pointer_register(pointer_line)
+        best, executed = min(
+            time_run(program, pointer_register, breakpoints)
+            for _ in range(repeat))
+        print(f'{description}:')
+        print(f'  Instructions: {executed}')
+        print(f'  Time: {best * 1000:.1f} ms')
+        print(f'  Instructions per second: {executed / best:,.0f}')
+    summarized = (
+        ('Day 19 with register 0 starting at 1', 19, day_19_seeded),
+        ('Day 21 last halting value', 21, day_21_last_value),
+    )
+    for description, day, workload in summarized:
+        module = load_day(2018, day)
+        pointer_line, *lines = read_lines(get_day_path(2018, day, 'input.txt'))
+        program = elfcode.parse_program(lines)
+        pointer_register = elfcode.parse_pointer_register(pointer_line)
+        timer = timeit.Timer(
+            lambda: workload(module, program, pointer_register))
+        best = min(timer.repeat(repeat=repeat, number=1))
+        print(f'{description}, summarized: {best * 1000:.1f} ms')
+
+
+def time_run(program, pointer_register, breakpoints):
+    """Get time of decoding and running program, and executed count."""
+    start = time.perf_counter()
+    registers = [0 for _ in range(6)]
+    operations = elfcode.decode(program, registers)
+    _, executed = elfcode.run(
+        operations, registers, pointer_register, breakpoints=breakpoints)
+    return time.perf_counter() - start, executed
+
+
+def day_19_seeded(_, program, pointer_register):
+    """Execute day 19 program with register 0 starting at 1."""
+    registers = [1] + [0 for _ in range(5)]
+    elfcode.execute(program, registers, pointer_register)
+
+
+def day_21_last_value(module, program, pointer_register):
+    """Find last distinct value of day 21 halting check."""
+    module.find_last_seed(program, pointer_register)
+
+
+if __name__ == '__main__':
+    main()
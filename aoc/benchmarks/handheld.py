@@ -0,0 +1,66 @@
+"""Benchmark of repairing 2020 day 8 programs, on synthetic programs.
+
+Synthetic program jumps only forwards, except for single jmp on its path
+jumping back to its start. Compares repair by running every flipped copy
+of the program with the single pass using reverse reachability, which
+alone is timed on the largest programs. Run from the repository root
+with:
+
+    python -m aoc.benchmarks.handheld
+"""
+import random
+import timeit
+
+from aoc.days import load_day
+
+
+def main(sizes=(1_000, 5_000, 100_000), trial_limit=5_000, seed=8):
+    module = load_day(2020, 8)
+    for size in sizes:
+        instructions = generate_program(size, random.Random(seed))
+        print(f'{size} instructions:')
+        repairs = [('Reverse reachability', module.find_repair)]
+        if size <= trial_limit:
+            repairs.append(('Flip and run', module.find_repair_by_trial))
+        for description, find_repair in repairs:
+            index, _ = find_repair(instructions)
+            assert terminates(module, instructions, index)
+            best = min(timeit.repeat(
+                lambda: find_repair(instructions), repeat=3, number=1))
+            print(f'  {description}: {best * 1000:.1f} ms, '
+                  f'flipped line {index}')
+
+
+def generate_program(size, generator):
+    """Generate program of size, looping because of single jmp."""
+    instructions = []
+    for _ in range(size):
+        kind = generator.random()
+        if kind < 0.5:
+            instructions.append(('acc', generator.randint(-50, 50)))
+        elif kind < 0.8:
+            instructions.append(('jmp', generator.randint(1, 5)))
+        else:
+            instructions.append(('nop', 0))
+    line = 0
+    path = []
+    while line < size:
+        path.append(line)
+        line += instructions[line][1] if instructions[line][0] == 'jmp' else 1
+    jumps = [line for line in path[len(path) // 2:]
+             if instructions[line][0] == 'jmp']
+    broken = generator.choice(jumps)
+    instructions[broken] = 'jmp', -broken
+    return instructions
+
+
+def terminates(module, instructions, index):
+    """Check if instructions with flipped index terminate."""
+    repaired = instructions[:]
+    operation, argument = repaired[index]
+    repaired[index] = module.FLIPS[operation], argument
+    return module.process_instructions(repaired) is not None
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark of MD5 searches, in hashes per second.
+
+Searches the lowest 2015 day 4 index with six leading zeros, hashing every
+candidate from scratch and comparing hex digests, as the day did before,
+then with the primed hash compared on raw digest, and with chunks spread
+over pools of processes, up to the number of CPUs. Then computes 2016 day
+14 hashes stretched 2017 times, uncached, with the same pools. Run from
+the repository root with:
+
+    python -m aoc.benchmarks.hashing
+"""
+import hashlib
+import os
+import time
+from itertools import islice
+
+from aoc import hashing
+
+KEY = 'bgvyzdsv'
+SALT = 'zpqevtbw'
+
+
+def main(stretched=2048):
+    searches = [('Hex digests', search_hex_digests),
+                ('Primed hash', lambda: hashing.find_lowest(KEY, 6))]
+    for processes in get_pool_sizes():
+        searches.append(
+            (f'Primed hash, {processes} processes',
+             lambda processes=processes: hashing.find_lowest(
+                 KEY, 6, processes=processes)))
+    for description, search in searches:
+        start = time.perf_counter()
+        index = search()
+        elapsed = time.perf_counter() - start
+        print(f'{description}: index {index} in {elapsed:.2f} s, '
+              f'{index / elapsed:,.0f} hashes per second')
+    previous_cache = hashing.CACHE
+    hashing.CACHE = False
+    try:
+        for processes in [None, *get_pool_sizes()]:
+            start = time.perf_counter()
+            for _ in islice(hashing.iter_stretched(SALT, 2017, processes),
+                            stretched):
+                pass
+            elapsed = time.perf_counter() - start
+            pool = f', {processes} processes' if processes else ''
+            print(f'Stretched hashes{pool}: {stretched} in {elapsed:.2f} s, '
+                  f'{stretched / elapsed:,.0f} hashes per second')
+    finally:
+        hashing.CACHE = previous_cache
+
+
+def get_pool_sizes():
+    """Get pool sizes, doubling from 2 up to the number of CPUs."""
+    sizes = []
+    processes = 2
+    while processes <= max(2, os.cpu_count()):
+        sizes.append(processes)
+        processes *= 2
+    return sizes
+
+
+def search_hex_digests():
+    """Search lowest index hashing it with key from scratch."""
+    index = 0
+    while not hashlib.md5(
+            f'{KEY}{index}'.encode()).hexdigest().startswith('000000'):
+        index += 1
+    return index
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Report of hot spots of the puzzle virtual machines.
+
+Profiles programs of days with every instruction interpreted, including
+2016 day 23 with assembunny optimization turned off and 2018 day 19 with
+Elfcode loops not summarized, and reports their most executed opcodes and
+loops. Run from the repository root with:
+
+    python -m aoc.benchmarks.hotspots
+"""
+from aoc import assembunny, elfcode, intcode, vm
+from aoc.days import get_day_path, load_day
+from aoc.inputs import read_lines
+
+
+def main(limit=3):
+    workloads = (
+        ('2015 day 23 with a starting at 1', 2015, 23, profile_computer),
+        ('2016 day 23 with a starting at 7, not optimized', 2016, 23,
+         profile_assembunny),
+        ('2017 day 23 coprocessor', 2017, 23, profile_coprocessor),
+        ('2018 day 19 with register 0 starting at 0, not summarized',
+         2018, 19, profile_elfcode),
+        ('2019 day 9 in sensor boost mode', 2019, 9, profile_intcode),
+        ('2020 day 8 repaired', 2020, 8, profile_handheld),
+    )
+    for description, year, day, workload in workloads:
+        lines = read_lines(get_day_path(year, day, 'input.txt'))
+        profile = vm.get_profile()
+        listing = workload(load_day(year, day), lines, profile)
+        print(f'{description}:')
+        for line in vm.report(profile, listing, limit):
+            print(f'  {line}')
+
+
+def profile_computer(module, lines, profile):
+    """Profile 2015 day 23 program with register a starting at 1."""
+    module.process(module.parse_instructions(lines), {'a': 1, 'b': 0},
+                   profile)
+    return lines
+
+
+def profile_assembunny(module, lines, profile):
+    """Profile 2016 day 23 program seeded with 7, without optimization."""
+    register = assembunny.get_empty_register()
+    register['a'] = 7
+    previous_optimize = assembunny.OPTIMIZE
+    assembunny.OPTIMIZE = False
+    try:
+        assembunny.run(register, assembunny.parse_program(lines), profile)
+    finally:
+        assembunny.OPTIMIZE = previous_optimize
+    return lines
+
+
+def profile_coprocessor(module, lines, profile):
+    """Profile 2017 day 23 coprocessor program in debug mode."""
+    register = {letter: 0 for letter in 'abcdefgh'}
+    module.process_instructions(
+        register, module.parse_instructions(lines), profile=profile)
+    return lines
+
+
+def profile_elfcode(module, lines, profile):
+    """Profile 2018 day 19 program from zeros, without summarized loops."""
+    pointer_line, *lines = lines
+    previous_summarize = elfcode.SUMMARIZE
+    elfcode.SUMMARIZE = False
+    try:
+        elfcode.execute(elfcode.parse_program(lines), [0] * 6,
+                        elfcode.parse_pointer_register(pointer_line),
+                        profile)
+    finally:
+        elfcode.SUMMARIZE = previous_summarize
+    return lines
+
+
+def profile_intcode(module, lines, profile):
+    """Profile 2019 day 9 program in sensor boost mode, interpreted."""
+    state = intcode.get_state(input_value=2)
+    state['profile'] = profile
+    intcode.process_program(intcode.parse_program(lines[0]), state,
+                            jit=False)
+    return None
+
+
+def profile_handheld(module, lines, profile):
+    """Profile 2020 day 8 boot code, with its corrupted instruction fixed."""
+    instructions = module.parse_instructions(lines)
+    index, _ = module.find_repair(instructions)
+    operation, argument = instructions[index]
+    instructions[index] = module.FLIPS[operation], argument
+    module.process_instructions(instructions, profile)
+    return lines
+
+
+if __name__ == '__main__':
+    main()
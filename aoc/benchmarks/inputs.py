@@ -0,0 +1,45 @@
+"""Benchmark of parsing inputs against loading them from the disk cache.
+
+Compares readlines with parsing, as days did before, with memory-mapped
+reading and with loading of cached parsed input, on the 2018 day 17 clays
+and 2020 day 20 squares. Run from the repository root with:
+
+    python -m aoc.benchmarks.inputs
+"""
+import timeit
+
+from aoc import inputs
+from aoc.days import get_day_path, load_day
+
+
+def main(repeat=5, number=20):
+    workloads = (
+        ('2018 day 17 clays', 2018, 17, 'parse_clays', inputs.read_lines),
+        ('2020 day 20 squares', 2020, 20, 'parse_squares',
+         inputs.read_blocks),
+    )
+    for description, year, day, parser, reader in workloads:
+        parse = getattr(load_day(year, day), parser)
+        path = get_day_path(year, day, 'input.txt')
+        inputs.load_cached(parse, path, reader)
+        timings = (
+            ('Read and parse', lambda: parse(read_file(path, reader))),
+            ('Memory-mapped and parse', lambda: parse(reader(path))),
+            ('Cached', lambda: inputs.load_cached(parse, path, reader)),
+        )
+        print(f'{description}:')
+        for name, workload in timings:
+            best = min(timeit.repeat(workload, repeat=repeat, number=number))
+            print(f'  {name}: {best / number * 1000:.2f} ms')
+
+
+def read_file(path, reader):
+    """Read file at path with open, in the form returned by reader."""
+    with open(path) as f:
+        if reader is inputs.read_blocks:
+            return f.read().strip().split('\n\n')
+        return [line.strip() for line in f]
+
+
+if __name__ == '__main__':
+    main()
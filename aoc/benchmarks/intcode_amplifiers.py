@@ -0,0 +1,47 @@
+"""Benchmark of 2019 day 7 amplifier chains.
+
+Reports phase permutations checked per second, sequentially and with the
+pool of processes, for chains of 5 amplifiers and for longer chains, which
+repeat each phase permutation. Run from the repository root with:
+
+    python -m aoc.benchmarks.intcode_amplifiers
+"""
+import math
+import os
+import time
+from functools import partial
+
+from aoc import intcode
+from aoc.days import get_day_path, load_day
+
+
+def main(repeats=(1, 4), processes=None):
+    module = load_day(2019, 7)
+    intcodes = intcode.read_program(get_day_path(2019, 7, 'input.txt'))
+    processes = processes or os.cpu_count()
+    runs = (
+        ('Signal', {0, 1, 2, 3, 4}, module.signal),
+        ('Feedback loop', {5, 6, 7, 8, 9}, module.with_feedback_loop),
+    )
+    for description, phase_set, signal_func in runs:
+        for repeat in repeats:
+            print(f'{description}, {len(phase_set) * repeat} amplifiers:')
+            chain_func = partial(repeat_chain, signal_func, repeat)
+            for pool_processes in (None, processes):
+                start = time.perf_counter()
+                module.find_highest_signal(
+                    intcodes, phase_set, chain_func, pool_processes)
+                elapsed = time.perf_counter() - start
+                mode = (f'{pool_processes} processes' if pool_processes
+                        else 'sequential')
+                throughput = math.factorial(len(phase_set)) / elapsed
+                print(f'  {mode}: {throughput:.0f} permutations/sec')
+
+
+def repeat_chain(signal_func, repeat, intcodes, combination):
+    """Get signal of chain, which repeats combination of phases."""
+    return signal_func(intcodes, tuple(combination) * repeat)
+
+
+if __name__ == '__main__':
+    main()
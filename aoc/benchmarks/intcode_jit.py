@@ -0,0 +1,71 @@
+"""Benchmark of interpreted and compiled Intcode on the 2019 workloads.
+
+Compares runs with and without compiling hot basic blocks on the day 9
+sensor boost, day 13 game played to completion and day 19 search for the
+square in tractor beam. Blocks compiled by previous runs are cleared
+before every run, so compiled timings include compiling. Run from the
+repository root with:
+
+    python -m aoc.benchmarks.intcode_jit
+"""
+import timeit
+
+from aoc import intcode
+from aoc.days import get_day_path, load_day
+
+
+def main(repeat=3):
+    workloads = (
+        ('Day 9 sensor boost', 9, sensor_boost),
+        ('Day 13 breakout', 13, breakout),
+        ('Day 19 tractor beam', 19, tractor_beam),
+    )
+    for description, day, workload in workloads:
+        module = load_day(2019, day)
+        intcodes = intcode.read_program(get_day_path(2019, day, 'input.txt'))
+        interpreted, compiled = [
+            time_workload(workload, module, intcodes, jit, repeat)
+            for jit in (False, True)]
+        print(f'{description}:')
+        print(f'  Interpreted: {interpreted * 1000:.1f} ms')
+        print(f'  Compiled: {compiled * 1000:.1f} ms')
+        print(f'  Speedup: {interpreted / compiled:.2f}x')
+
+
+def sensor_boost(_, intcodes):
+    """Run day 9 BOOST program in sensor boost mode."""
+    intcode.process_program(intcodes[:], intcode.get_state(input_value=2))
+
+
+def breakout(module, intcodes):
+    """Play day 13 game until last block is broken."""
+    module.win_game(intcodes[:], intcode.get_state())
+
+
+def tractor_beam(module, intcodes):
+    """Find first 100x100 square in day 19 tractor beam."""
+    module.find_square_in_beam(module.warm_up(intcodes), 100)
+
+
+def time_workload(workload, module, intcodes, jit, repeat):
+    """Get best time of workload runs, with jit toggled in Intcode and day.
+
+    Days choosing the mode themselves have their own JIT flag.
+    """
+    modules = [intcode]
+    if hasattr(module, 'JIT'):
+        modules.append(module)
+    previous_jits = [flagged.JIT for flagged in modules]
+    for flagged in modules:
+        flagged.JIT = jit
+    try:
+        timer = timeit.Timer(lambda: workload(module, intcodes),
+                             setup=intcode.BLOCK_CACHE.clear)
+        return min(timer.repeat(repeat=repeat, number=1))
+    finally:
+        for flagged, previous_jit in zip(modules, previous_jits):
+            flagged.JIT = previous_jit
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Benchmark of Intcode memory on the 2019 day 9 BOOST program.
+
+Compares growable dense memory with keeping every address past the end of
+program in the sparse dictionary, for the self-test and for the sensor
+boost mode, and single access with the exception based fallback used
+before. Run from the repository root with:
+
+    python -m aoc.benchmarks.intcode_memory
+"""
+import timeit
+from collections import defaultdict
+
+from aoc import intcode
+from aoc.days import get_day_path
+
+
+DAY_9_INPUT = get_day_path(2019, 9, 'input.txt')
+RUNS = (
+    ('BOOST self-test', 1),
+    ('Sensor boost', 2),
+)
+
+
+class CountingMemory(dict):
+    """Sparse memory counting number of accesses."""
+
+    def __init__(self):
+        super().__init__()
+        self.accesses = 0
+
+    def get(self, address, default=None):
+        self.accesses += 1
+        return super().get(address, default)
+
+    def __setitem__(self, address, value):
+        self.accesses += 1
+        super().__setitem__(address, value)
+
+
+def main(repeat=5):
+    intcodes = intcode.read_program(DAY_9_INPUT)
+    for description, input_value in RUNS:
+        accesses = count_sparse_accesses(intcodes, input_value)
+        dense, sparse = [
+            time_run(intcodes, input_value, dense_limit, repeat)
+            for dense_limit in (intcode.DENSE_LIMIT, 0)]
+        print(f'{description}:')
+        print(f'  Memory accesses past end of program: {accesses}')
+        print(f'  Dense memory: {dense * 1000:.3f} ms')
+        print(f'  Sparse memory: {sparse * 1000:.3f} ms')
+        print('  Difference per access past end of program: '
+              f'{(sparse - dense) / accesses * 10 ** 9:.1f} ns')
+    legacy, current = time_single_access(intcodes)
+    print(f'Single access with IndexError fallback: {legacy:.1f} ns')
+    print(f'Single access to dense memory: {current:.1f} ns')
+
+
+def run_program(intcodes, input_value, memory=None):
+    """Run copy of intcodes with input_value, using optional memory."""
+    state = intcode.get_state(input_value=input_value)
+    if memory is not None:
+        state['memory'] = memory
+    intcode.process_program(intcodes[:], state)
+    return state
+
+
+def count_sparse_accesses(intcodes, input_value):
+    """Count accesses past end of program when running with input_value."""
+    memory = CountingMemory()
+    with_dense_limit(0, run_program, intcodes, input_value, memory)
+    return memory.accesses
+
+
+def time_run(intcodes, input_value, dense_limit, repeat):
+    """Get best time of runs with input_value and dense_limit."""
+    timer = timeit.Timer(lambda: with_dense_limit(
+        dense_limit, run_program, intcodes, input_value))
+    return min(timer.repeat(repeat=repeat, number=1))
+
+
+def with_dense_limit(dense_limit, func, *args):
+    """Call func with args, while Intcode memory uses dense_limit."""
+    previous_limit = intcode.DENSE_LIMIT
+    intcode.DENSE_LIMIT = dense_limit
+    try:
+        return func(*args)
+    finally:
+        intcode.DENSE_LIMIT = previous_limit
+
+
+def time_single_access(intcodes, number=1_000_000):
+    """Get time in ns of single access past end of program, before and now."""
+    program = intcodes[:]
+    memory = defaultdict(int)
+    address = len(program) + 1
+
+    def legacy_read():
+        try:
+            return program[address]
+        except IndexError:
+            return memory[address]
+
+    grown = intcodes[:]
+    intcode.grow_memory(grown, address)
+
+    def dense_read():
+        return grown[address] if address < len(grown) else 0
+
+    return [
+        timeit.timeit(read, number=number) / number * 10 ** 9
+        for read in (legacy_read, dense_read)]
+
+
+if __name__ == '__main__':
+    main()
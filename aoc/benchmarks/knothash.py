@@ -0,0 +1,45 @@
+"""Benchmark of the 2017 day 14 knot hash disk pipeline.
+
+Times every stage for the day 14 key: hashing 128 rows serially and in
+pools of processes up to the number of CPUs, counting used squares and
+labelling regions, then the full pipeline. Run from the repository root
+with:
+
+    python -m aoc.benchmarks.knothash
+"""
+import os
+import timeit
+
+from aoc import knothash
+from aoc.days import load_day
+
+
+def main(repeat=5, number=3):
+    module = load_day(2017, 14)
+    key = module.puzzle
+    grid = knothash.get_rows(key)
+    stages = [('Rows', lambda: knothash.get_rows(key))]
+    processes = 2
+    while processes <= max(2, os.cpu_count()):
+        stages.append((f'Rows, {processes} processes',
+                       lambda processes=processes: knothash.get_rows(
+                           key, processes)))
+        processes *= 2
+    stages.extend([
+        ('Used squares', lambda: module.count_used(grid)),
+        ('Regions', lambda: module.get_regions(grid)),
+        ('Full pipeline', lambda: pipeline(module, key)),
+    ])
+    for description, stage in stages:
+        best = min(timeit.repeat(stage, repeat=repeat, number=number))
+        print(f'{description}: {best / number * 1000:.2f} ms')
+
+
+def pipeline(module, key):
+    """Run day 14 from key to count of used squares and regions."""
+    grid = module.get_grid_from(key, os.cpu_count())
+    return module.count_used(grid), len(module.get_regions(grid))
+
+
+if __name__ == '__main__':
+    main()
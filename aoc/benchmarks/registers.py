@@ -0,0 +1,63 @@
+"""Benchmark of interpreted against compiled register machine programs.
+
+Runs the 2017 day 8 instructions, repeated to a long program, and the 2015
+day 23 program from many starting values of register a, with interpreters
+of the days and with programs compiled to Python functions, compiled from
+source and loaded from cache. Run from the repository root with:
+
+    python -m aoc.benchmarks.registers
+"""
+import timeit
+from collections import defaultdict
+
+from aoc import codegen
+from aoc.days import get_day_path, load_day
+from aoc.inputs import read_lines
+
+
+def main(repeat=5, number=3, copies=100, seeds=100):
+    registers = load_day(2017, 8)
+    instructions = registers.parse_instructions(
+        read_lines(get_day_path(2017, 8, 'input.txt'))) * copies
+    computer = load_day(2015, 23)
+    program = computer.parse_instructions(
+        read_lines(get_day_path(2015, 23, 'input.txt')))
+    workloads = (
+        (f'2017 day 8, {len(instructions)} instructions',
+         lambda: registers.process_instructions(
+             defaultdict(int), instructions),
+         lambda: registers.compile_instructions(instructions),
+         lambda compiled: compiled({})),
+        (f'2015 day 23, {seeds} starting values',
+         lambda: [computer.process(program, {'a': a, 'b': 0})
+                  for a in range(seeds)],
+         lambda: computer.compile_program(program),
+         lambda compiled: [compiled({'a': a, 'b': 0})
+                           for a in range(seeds)]),
+    )
+    for description, interpret, compile_, run in workloads:
+        compiled = compile_()
+        timings = (
+            ('Interpreted', interpret),
+            ('Compiling', lambda: compile_cached(compile_, False)),
+            ('Compiling from cache', lambda: compile_cached(compile_, True)),
+            ('Compiled', lambda: run(compiled)),
+        )
+        print(f'{description}:')
+        for name, workload in timings:
+            best = min(timeit.repeat(workload, repeat=repeat, number=number))
+            print(f'  {name}: {best / number * 1000:.2f} ms')
+
+
+def compile_cached(compile_, cache):
+    """Compile program with compile_, with cache of codegen set to cache."""
+    previous = codegen.CACHE
+    codegen.CACHE = cache
+    try:
+        return compile_()
+    finally:
+        codegen.CACHE = previous
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""Benchmark suite of hot functions across years, with regression gating.
+
+Every case runs one hot function of a day on a reduced workload, taking
+well under a second. Median time of the repeats, steadier than the best
+one, is compared with the recorded baseline, and run fails when a case
+got slower by more than the threshold. Run from the repository root with:
+
+    python -m aoc bench
+    python -m aoc bench 2016 2018-09 --repeat 5
+    python -m aoc bench --update
+
+Cases are selected by prefix of their names, like 2016 or 2018-09.
+"""
+import json
+import os
+import statistics
+import sys
+import time
+import timeit
+from collections import namedtuple
+
+from aoc import hashing, intcode
+from aoc.days import get_day_path, load_day
+from aoc.inputs import read_lines
+
+BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+THRESHOLD = 0.25
+
+Case = namedtuple('Case', 'name year day setup')
+
+
+def get_file_lines(year, day, file_name='input.txt'):
+    """Read stripped lines of file from directory of day of year."""
+    return read_lines(get_day_path(year, day, file_name))
+
+
+def setup_number_suffix(module):
+    """Mine MD5 hash with five leading zeroes for 2015 day 4 key."""
+    return lambda: module.get_number_suffix('bgvyzdsv', 5)
+
+
+def setup_lowest_house(module):
+    """Deliver presents to houses until 500000 presents in one house."""
+    return lambda: module.find_lowest_house_over(500_000, 10)
+
+
+def setup_pad_key(module):
+    """Find 4th one time pad key of 2016 day 14 salt, hashing uncached."""
+    def find_pad_key():
+        previous_cache = hashing.CACHE
+        hashing.CACHE = False
+        try:
+            return module.find_nth_pad_key('zpqevtbw', 4)
+        finally:
+            hashing.CACHE = previous_cache
+    return find_pad_key
+
+
+def setup_safe_tiles(module):
+    """Count safe tiles in 4000 rows of 2016 day 18 input."""
+    line = get_file_lines(2016, 18)[0]
+    return lambda: module.get_safe_tiles_count(line, 4000)
+
+
+def setup_vault_paths(module):
+    """Find shortest and longest vault paths of 2016 day 17 example."""
+    return lambda: module.find_paths('ulqzkmiv')
+
+
+def setup_assembunny(module):
+    """Run 2016 day 23 assembunny program seeded with 12."""
+    program = module.parse_program(get_file_lines(2016, 23))
+    register = module.get_empty_register()
+    register['a'] = 12
+    return lambda: module.run(register, program)
+
+
+def setup_jumps(module):
+    """Process jumps of 2017 day 5 input, with offsets increasing."""
+    jumps = [int(line) for line in get_file_lines(2017, 5)]
+    return lambda: module.make_jumps(jumps, module.increase)
+
+
+def setup_disk_regions(module):
+    """Hash 2017 day 14 example disk grid and label its regions."""
+    return lambda: len(module.get_regions(
+        module.get_grid_from(module.example)))
+
+
+def setup_compare_pairs(module):
+    """Compare 200000 pairs of 2017 day 15 generators."""
+    return lambda: module.compare_pairs(module.puzzle, 200_000)
+
+
+def setup_spinlock(module):
+    """Track value after 0 in 2017 day 17 spinlock for 300000 steps."""
+    return lambda: module.find_value_after_0(module.puzzle, 300_000)
+
+
+def setup_marbles(module):
+    """Play 2018 day 9 marble game up to last marble of input."""
+    numbers = [int(part) for part in get_file_lines(2018, 9)[0].split()
+               if part.isdigit()]
+    players_count, max_points = numbers
+    return lambda: module.play_marbles(
+        [0] * players_count, module.get_starting_marble(), max_points)
+
+
+def setup_fuel_cells(module):
+    """Find 3x3 square with largest power in 2018 day 11 grid."""
+    def find_square():
+        grid = module.fill_grid(module.get_grid(300, 300), module.puzzle)
+        return module.find_largest_sub_grid(grid)
+    return find_square
+
+
+def setup_sensor_boost(_):
+    """Run 2019 day 9 BOOST program in sensor boost mode."""
+    program = intcode.read_program(get_day_path(2019, 9, 'input.txt'))
+    return lambda: intcode.process_program(
+        program[:], intcode.get_state(input_value=2))
+
+
+def setup_memory_game(module):
+    """Play 2020 day 15 memory game to 300000th number."""
+    return lambda: module.say_number(module.NUMS, 300_000)
+
+
+def setup_cups(module):
+    """Play 300000 moves of 2020 day 23 cups game with 100000 cups."""
+    return lambda: module.play_cups(
+        module.parse_puzzle(module.puzzle_input, 100_000), 300_000)
+
+
+CASES = (
+    Case('2015-04-get_number_suffix', 2015, 4, setup_number_suffix),
+    Case('2015-20-find_lowest_house_over', 2015, 20, setup_lowest_house),
+    Case('2016-14-find_nth_pad_key', 2016, 14, setup_pad_key),
+    Case('2016-18-get_safe_tiles_count', 2016, 18, setup_safe_tiles),
+    Case('2016-17-find_paths', 2016, 17, setup_vault_paths),
+    Case('2016-23-run', 2016, 23, setup_assembunny),
+    Case('2017-05-make_jumps', 2017, 5, setup_jumps),
+    Case('2017-14-get_regions', 2017, 14, setup_disk_regions),
+    Case('2017-15-compare_pairs', 2017, 15, setup_compare_pairs),
+    Case('2017-17-find_value_after_0', 2017, 17, setup_spinlock),
+    Case('2018-09-play_marbles', 2018, 9, setup_marbles),
+    Case('2018-11-find_largest_sub_grid', 2018, 11, setup_fuel_cells),
+    Case('2019-09-process_program', 2019, 9, setup_sensor_boost),
+    Case('2020-15-say_number', 2020, 15, setup_memory_game),
+    Case('2020-23-play_cups', 2020, 23, setup_cups),
+)
+
+
+def run(names=(), repeat=5, threshold=THRESHOLD, update=False,
+        baseline=BASELINE):
+    """Run cases selected by names, comparing them with baseline.
+
+    With update, measured timings are recorded as new baseline instead.
+    Returns names of cases slower than baseline by more than threshold.
+    """
+    baselines = read_baseline(baseline)
+    regressions = []
+    for case in select_cases(names):
+        timing = time_case(case, repeat)
+        expected = baselines.get(case.name)
+        print(format_timing(case.name, timing, expected, threshold))
+        if update:
+            baselines[case.name] = round(timing, 6)
+        elif expected is not None and timing > expected * (1 + threshold):
+            regressions.append(case.name)
+    if update:
+        write_baseline(baselines, baseline)
+    elif regressions:
+        print(f'Regressions over {threshold:.0%}: {", ".join(regressions)}',
+              file=sys.stderr)
+    return regressions
+
+
+def select_cases(names=()):
+    """Select cases with names starting with any of names, or all cases."""
+    if not names:
+        return list(CASES)
+    selected = [case for case in CASES
+                if any(case.name.startswith(name) for name in names)]
+    if not selected:
+        raise ValueError(f'No benchmark matches {", ".join(names)}')
+    return selected
+
+
+def time_case(case, repeat=5):
+    """Get median time of single case run, done from directory of its day.
+
+    Time is measured as CPU time of process, not disturbed by other
+    processes, and short workloads are run in loops of at least 0.2 s.
+    """
+    cwd = os.getcwd()
+    os.chdir(os.path.dirname(get_day_path(case.year, case.day)))
+    try:
+        timer = timeit.Timer(case.setup(load_day(case.year, case.day)),
+                             timer=time.process_time)
+        number, _ = timer.autorange()
+        return statistics.median(
+            timer.repeat(repeat=repeat, number=number)) / number
+    finally:
+        os.chdir(cwd)
+
+
+def format_timing(name, timing, expected=None, threshold=THRESHOLD):
+    """Format timing of case, with change against expected baseline."""
+    line = f'{name:<35} {timing * 1000:>9.1f} ms'
+    if expected is None:
+        return line + '  (no baseline)'
+    change = timing / expected - 1
+    line += f'  {change:>+7.1%} vs {expected * 1000:.1f} ms'
+    if change > threshold:
+        line += '  REGRESSION'
+    return line
+
+
+def read_baseline(path=BASELINE):
+    """Read baseline timings of cases in seconds, empty when missing."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_baseline(baselines, path=BASELINE):
+    """Write baseline timings of cases to path."""
+    with open(path, 'w') as f:
+        json.dump(dict(sorted(baselines.items())), f, indent=2)
+        f.write('\n')
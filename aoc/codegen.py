@@ -0,0 +1,92 @@
+"""Compiling of register machine programs to single Python functions.
+
+Days generate source lines of the function body, with registers of the
+program held in local variables. Programs with jumps are split to basic
+blocks, selected by binary search over their starting pointers, so every
+jump costs only a few comparisons of the pc local.
+
+Compiling long source takes much longer than running it once, so with
+CACHE turned on, compiled code is cached on disk, in __pycache__ of this
+package, keyed by hash of the source and by the interpreter, like .pyc
+files, as marshalled code works only on the Python version writing it.
+The programs of the days compile in milliseconds, so it is off by default.
+"""
+import hashlib
+import marshal
+import os
+import sys
+from importlib.util import MAGIC_NUMBER
+
+CACHE = False
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         '__pycache__')
+
+
+def compile_function(name, parameters, body):
+    """Compile function with parameters, from lines of its body."""
+    source = ''.join(
+        [f'def {name}({", ".join(parameters)}):\n']
+        + [f'    {line}\n' for line in body])
+    namespace = {}
+    exec(load_code(source, name), namespace)
+    return namespace[name]
+
+
+def load_code(source, name):
+    """Load code compiled from source, from cache if already compiled."""
+    cache_tag = sys.implementation.cache_tag
+    if not CACHE or cache_tag is None:
+        return compile(source, f'<{name}>', 'exec')
+    digest = hashlib.sha256(MAGIC_NUMBER + source.encode()).hexdigest()[:16]
+    cache_path = os.path.join(
+        CACHE_DIR, f'codegen.{name}.{digest}.{cache_tag}.marshal')
+    try:
+        with open(cache_path, 'rb') as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    code = compile(source, f'<{name}>', 'exec')
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    temporary_path = f'{cache_path}.{os.getpid()}'
+    with open(temporary_path, 'wb') as f:
+        marshal.dump(code, f)
+    os.replace(temporary_path, cache_path)
+    return code
+
+
+def get_local_names(names):
+    """Get mapping of register names to names of local variables.
+
+    Registers can be named like Python keywords, so they are renamed.
+    """
+    return {name: f'r{index}' for index, name in enumerate(sorted(names))}
+
+
+def get_leaders(size, jumps):
+    """Get sorted starting pointers of basic blocks of program of size.
+
+    Jumps are (pointer, target) pairs. Blocks start at 0, at targets of
+    jumps inside program and after every jump.
+    """
+    leaders = {0}
+    for pointer, target in jumps:
+        if 0 <= target < size:
+            leaders.add(target)
+        if pointer + 1 < size:
+            leaders.add(pointer + 1)
+    return sorted(leaders)
+
+
+def get_dispatch(blocks, indent=''):
+    """Get lines selecting block by pc, with nested ifs of binary search.
+
+    Blocks are sorted list of (starting pointer, lines of block).
+    """
+    if len(blocks) == 1:
+        return [indent + line for line in blocks[0][1]]
+    middle = len(blocks) // 2
+    return (
+        [f'{indent}if pc < {blocks[middle][0]}:']
+        + get_dispatch(blocks[:middle], indent + '    ')
+        + [f'{indent}else:']
+        + get_dispatch(blocks[middle:], indent + '    '))
@@ -0,0 +1,93 @@
+"""Locating and loading solutions of the Advent of Code days.
+
+Main modules of days are named like aoc.day_2016_17. Finder of these
+names is installed into sys.meta_path by importing the aoc package, so
+processes spawned by a pool, like pools of days run by the runner, import
+days to unpickle their functions.
+"""
+import importlib.abc
+import importlib.util
+import os
+import re
+import sys
+
+
+ROOT = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+DAY_NAME = re.compile(r'aoc\.day_(\d+)_(\d+)')
+
+
+def get_year_path(year):
+    """Get path to directory with solutions of year."""
+    return os.path.join(ROOT, f'advent-of-code-{year}')
+
+
+def get_day_path(year, day, file_name='main.py'):
+    """Get path to file_name in directory of year and day."""
+    return os.path.join(get_year_path(year), f'day {day}', file_name)
+
+
+def get_years():
+    """Get sorted years with solutions."""
+    return sorted(
+        int(match.group(1))
+        for match in map(re.compile(r'advent-of-code-(\d+)$').match,
+                         os.listdir(ROOT))
+        if match)
+
+
+def get_days(year):
+    """Get sorted days of year with solutions."""
+    days = []
+    for name in os.listdir(get_year_path(year)):
+        match = re.match(r'day (\d+)$', name)
+        if match and os.path.exists(get_day_path(year, match.group(1))):
+            days.append(int(match.group(1)))
+    return sorted(days)
+
+
+def parse_days(days_spec, available):
+    """Parse days_spec, like '1-5,7', to sorted list of available days.
+
+    Empty days_spec selects all available days.
+    """
+    if not days_spec:
+        return sorted(available)
+    days = set()
+    for part in days_spec.split(','):
+        first, _, last = part.partition('-')
+        days.update(range(int(first), int(last or first) + 1))
+    return sorted(days.intersection(available))
+
+
+def load_day(year, day):
+    """Load main module of year and day.
+
+    Module is registered in sys.modules, so its functions can be pickled
+    and sent to pool processes.
+    """
+    name = f'aoc.day_{year}_{day}'
+    spec = importlib.util.spec_from_file_location(
+        name, get_day_path(year, day))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class DayFinder(importlib.abc.MetaPathFinder):
+    """Finder of main modules of days, by their names from load_day."""
+
+    def find_spec(self, name, path=None, target=None):
+        """Get spec of main module of day named name, or None."""
+        match = DAY_NAME.fullmatch(name)
+        if match is None:
+            return None
+        day_path = get_day_path(*map(int, match.groups()))
+        if not os.path.exists(day_path):
+            return None
+        return importlib.util.spec_from_file_location(name, day_path)
+
+
+if not any(isinstance(finder, DayFinder) for finder in sys.meta_path):
+    sys.meta_path.append(DayFinder())
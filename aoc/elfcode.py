@@ -0,0 +1,390 @@
+"""Elfcode engine shared by the Advent of Code 2018 solutions.
+
+Program is decoded once, every instruction to closure bound to the list of
+registers and to its own operands, so running it is just calling them in
+order. Register bound to instruction pointer is a fixed slot of the same
+list, written before and read after every instruction.
+
+Static analysis matches known loops in the program, whatever registers
+they use, and summarizes them to native Python operations: nested loops
+summing divisors of a register, and loop dividing a register by counting
+up. trace runs program with the summaries in place of the loops. With
+SUMMARIZE turned off, every instruction is run, and profile of the run
+shows the loops, which would be summarized.
+"""
+from aoc.vm import record
+
+OPERATIONS = (
+    'addr', 'addi', 'mulr', 'muli', 'banr', 'bani', 'borr', 'bori',
+    'setr', 'seti', 'gtir', 'gtri', 'gtrr', 'eqir', 'eqri', 'eqrr'
+)
+SUMMARIZE = True
+
+
+def addr(registers, a, b, c):
+    """Decode addr: register c = register a + register b."""
+    def operation():
+        registers[c] = registers[a] + registers[b]
+    return operation
+
+
+def addi(registers, a, b, c):
+    """Decode addi: register c = register a + value b."""
+    def operation():
+        registers[c] = registers[a] + b
+    return operation
+
+
+def mulr(registers, a, b, c):
+    """Decode mulr: register c = register a * register b."""
+    def operation():
+        registers[c] = registers[a] * registers[b]
+    return operation
+
+
+def muli(registers, a, b, c):
+    """Decode muli: register c = register a * value b."""
+    def operation():
+        registers[c] = registers[a] * b
+    return operation
+
+
+def banr(registers, a, b, c):
+    """Decode banr: register c = register a & register b."""
+    def operation():
+        registers[c] = registers[a] & registers[b]
+    return operation
+
+
+def bani(registers, a, b, c):
+    """Decode bani: register c = register a & value b."""
+    def operation():
+        registers[c] = registers[a] & b
+    return operation
+
+
+def borr(registers, a, b, c):
+    """Decode borr: register c = register a | register b."""
+    def operation():
+        registers[c] = registers[a] | registers[b]
+    return operation
+
+
+def bori(registers, a, b, c):
+    """Decode bori: register c = register a | value b."""
+    def operation():
+        registers[c] = registers[a] | b
+    return operation
+
+
+def setr(registers, a, _, c):
+    """Decode setr: register c = register a."""
+    def operation():
+        registers[c] = registers[a]
+    return operation
+
+
+def seti(registers, a, _, c):
+    """Decode seti: register c = value a."""
+    def operation():
+        registers[c] = a
+    return operation
+
+
+def gtir(registers, a, b, c):
+    """Decode gtir: register c = value a > register b."""
+    def operation():
+        registers[c] = 1 if a > registers[b] else 0
+    return operation
+
+
+def gtri(registers, a, b, c):
+    """Decode gtri: register c = register a > value b."""
+    def operation():
+        registers[c] = 1 if registers[a] > b else 0
+    return operation
+
+
+def gtrr(registers, a, b, c):
+    """Decode gtrr: register c = register a > register b."""
+    def operation():
+        registers[c] = 1 if registers[a] > registers[b] else 0
+    return operation
+
+
+def eqir(registers, a, b, c):
+    """Decode eqir: register c = value a == register b."""
+    def operation():
+        registers[c] = 1 if a == registers[b] else 0
+    return operation
+
+
+def eqri(registers, a, b, c):
+    """Decode eqri: register c = register a == value b."""
+    def operation():
+        registers[c] = 1 if registers[a] == b else 0
+    return operation
+
+
+def eqrr(registers, a, b, c):
+    """Decode eqrr: register c = register a == register b."""
+    def operation():
+        registers[c] = 1 if registers[a] == registers[b] else 0
+    return operation
+
+
+DECODERS = {name: globals()[name] for name in OPERATIONS}
+COMMUTATIVE = {'addr', 'mulr', 'banr', 'borr', 'eqrr'}
+
+# Patterns of loops, with str operands being registers bound to names,
+# or values when starting with $, ('@', offset) values relative to start
+# of the loop and None any value.
+DIVISOR_SUM = (
+    ('seti', 1, None, 'x'),
+    ('seti', 1, None, 'y'),
+    ('mulr', 'x', 'y', 'test'),
+    ('eqrr', 'test', 'number', 'test'),
+    ('addr', 'test', 'ip', 'ip'),
+    ('addi', 'ip', 1, 'ip'),
+    ('addr', 'x', 'total', 'total'),
+    ('addi', 'y', 1, 'y'),
+    ('gtrr', 'y', 'number', 'test'),
+    ('addr', 'ip', 'test', 'ip'),
+    ('seti', ('@', 1), None, 'ip'),
+    ('addi', 'x', 1, 'x'),
+    ('gtrr', 'x', 'number', 'test'),
+    ('addr', 'test', 'ip', 'ip'),
+    ('seti', ('@', 0), None, 'ip'),
+)
+DIVISION = (
+    ('seti', 0, None, 'quotient'),
+    ('addi', 'quotient', 1, 'test'),
+    ('muli', 'test', '$divisor', 'test'),
+    ('gtrr', 'test', 'dividend', 'test'),
+    ('addr', 'test', 'ip', 'ip'),
+    ('addi', 'ip', 1, 'ip'),
+    ('seti', ('@', 8), None, 'ip'),
+    ('addi', 'quotient', 1, 'quotient'),
+    ('seti', ('@', 0), None, 'ip'),
+)
+
+
+def parse_program(lines):
+    """Parse lines to list of tuples with instruction name and values."""
+    program = []
+    for line in lines:
+        name, *nums = line.split()
+        program.append((name, *[int(num) for num in nums]))
+    return program
+
+
+def parse_pointer_register(line):
+    """Parse #ip line to number of register bound to instruction pointer."""
+    return int(line.split()[1])
+
+
+def decode_instruction(registers, name, a, b, c):
+    """Decode instruction to closure operating on registers."""
+    return DECODERS[name](registers, a, b, c)
+
+
+def decode(program, registers):
+    """Decode program to list of closures operating on registers."""
+    return [decode_instruction(registers, *instruction)
+            for instruction in program]
+
+
+def run(operations, registers, pointer_register, pointer=0,
+        breakpoints=frozenset()):
+    """Run decoded operations from pointer, with pointer_register bound.
+
+    Runs until pointer leaves the program, or gets to one of breakpoints,
+    which is not checked for the starting pointer, so run can be resumed
+    from breakpoint. Returns (pointer, number of executed instructions).
+    """
+    size = len(operations)
+    executed = 0
+    while 0 <= pointer < size:
+        if executed and pointer in breakpoints:
+            break
+        registers[pointer_register] = pointer
+        operations[pointer]()
+        pointer = registers[pointer_register] + 1
+        executed += 1
+    return pointer, executed
+
+
+def run_profiled(program, operations, registers, pointer_register,
+                 pointer, breakpoints, profile):
+    """Run decoded operations like run, recording them in profile."""
+    size = len(operations)
+    executed = 0
+    previous = None
+    while 0 <= pointer < size:
+        if executed and pointer in breakpoints:
+            break
+        record(profile, previous, pointer, program[pointer][0])
+        previous = pointer
+        registers[pointer_register] = pointer
+        operations[pointer]()
+        pointer = registers[pointer_register] + 1
+        executed += 1
+    return pointer, executed
+
+
+def trace(program, registers, pointer_register, breakpoints=frozenset(),
+          profile=None):
+    """Execute program on registers, with matched loops summarized.
+
+    Yields pointer of every reached breakpoint, before its instruction is
+    executed, so registers can be inspected there. Executed instructions
+    are recorded in profile.
+    """
+    operations = decode(program, registers)
+    summaries = summarize(program, pointer_register) if SUMMARIZE else {}
+    stops = frozenset(breakpoints) | summaries.keys()
+    pointer = 0
+    while 0 <= pointer < len(operations):
+        if pointer in breakpoints:
+            yield pointer
+        summary = summaries.get(pointer)
+        if summary is not None:
+            next_pointer = summary(registers)
+            if next_pointer is not None:
+                pointer = next_pointer
+                continue
+        if profile is None:
+            pointer, _ = run(operations, registers, pointer_register,
+                             pointer, stops)
+        else:
+            pointer, _ = run_profiled(program, operations, registers,
+                                      pointer_register, pointer, stops,
+                                      profile)
+
+
+def execute(program, registers, pointer_register, profile=None):
+    """Execute program on registers, with matched loops summarized."""
+    for _ in trace(program, registers, pointer_register, profile=profile):
+        pass
+    return registers
+
+
+def summarize(program, pointer_register):
+    """Get summaries of loops matched in program, by their start pointer.
+
+    Summary gets registers and returns pointer after the loop, or None when
+    loop can not be summarized for the registers.
+    """
+    summaries = {}
+    for start in range(len(program)):
+        for pattern, get_summary in ((DIVISOR_SUM, summarize_divisor_sum),
+                                     (DIVISION, summarize_division)):
+            names = match(pattern, program, start, pointer_register)
+            if names is not None:
+                del names['ip']
+                summaries[start] = get_summary(
+                    start + len(pattern),
+                    **{name.lstrip('$'): value
+                       for name, value in names.items()})
+                break
+    return summaries
+
+
+def summarize_divisor_sum(end, x, y, test, number, total):
+    """Summarize loops adding divisors of number register to total."""
+    def summary(registers):
+        value = registers[number]
+        if value < 1:
+            return None
+        registers[total] += sum_divisors(value)
+        registers[x] = registers[y] = value + 1
+        registers[test] = 1
+        return end
+    return summary
+
+
+def summarize_division(end, quotient, test, divisor, dividend):
+    """Summarize loop setting quotient to dividend register // divisor."""
+    def summary(registers):
+        if divisor < 1 or registers[dividend] < 0:
+            return None
+        registers[quotient] = registers[dividend] // divisor
+        registers[test] = 1
+        return end
+    return summary
+
+
+def sum_divisors(number):
+    """Sum all divisors of number."""
+    total = 0
+    divisor = 1
+    while divisor * divisor <= number:
+        if number % divisor == 0:
+            total += divisor
+            if divisor * divisor != number:
+                total += number // divisor
+        divisor += 1
+    return total
+
+
+def match(pattern, program, start, pointer_register):
+    """Match pattern with program from start.
+
+    Returns registers bound to names of pattern, different for every name,
+    and values bound to names starting with $, or None if pattern does not
+    match.
+    """
+    if start + len(pattern) > len(program):
+        return None
+    return match_instructions(
+        pattern, program[start:start + len(pattern)], start,
+        {'ip': pointer_register})
+
+
+def match_instructions(pattern, instructions, start, names):
+    """Match pattern with instructions, extending names bound so far."""
+    if not pattern:
+        return names
+    (name, *operands), *rest_pattern = pattern
+    instruction_name, *values = instructions[0]
+    if name != instruction_name:
+        return None
+    orders = [values]
+    if name in COMMUTATIVE:
+        orders.append([values[1], values[0], values[2]])
+    for ordered in orders:
+        bound = bind_operands(operands, ordered, start, names)
+        if bound is not None:
+            matched = match_instructions(
+                rest_pattern, instructions[1:], start, bound)
+            if matched is not None:
+                return matched
+    return None
+
+
+def bind_operands(operands, values, start, names):
+    """Bind str operands to register values, checking the other operands.
+
+    Returns copy of names with new bindings, or None if operands differ.
+    """
+    names = names.copy()
+    for operand, value in zip(operands, values):
+        if operand is None:
+            continue
+        if isinstance(operand, tuple):
+            if value != start + operand[1]:
+                return None
+        elif isinstance(operand, int):
+            if value != operand:
+                return None
+        elif operand in names:
+            if names[operand] != value:
+                return None
+        elif operand.startswith('$'):
+            names[operand] = value
+        elif value in [bound for name, bound in names.items()
+                       if not name.startswith('$')]:
+            return None
+        else:
+            names[operand] = value
+    return names
@@ -0,0 +1,187 @@
+"""MD5 hash searches shared by the Advent of Code solutions.
+
+Candidates are prefix followed by decimal index. Prefix is hashed once,
+and every candidate continues from a copy of that primed hash. Leading
+zeros are checked on raw digest, by comparing it with the lowest digest
+having fewer zeros, without formatting it to hex.
+
+Index space is searched in ordered chunks. With processes, chunks are
+hashed in the pool, with a few of them in flight per process, and their
+results are still yielded in order, so the first one found has the lowest
+index.
+
+Stretched hashes, hashed again from their hex digest many times, are
+cached on disk, in __pycache__ of this package, by salt and stretch, and
+computed only past the cached ones. Cache is appended in chunks headed by
+their starting index, so chunks appended twice by concurrent runs are
+read only once.
+"""
+import hashlib
+import os
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+
+CHUNK_SIZE = 1 << 16
+STRETCHED_CHUNK_SIZE = 1 << 10
+CACHE = True
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         '__pycache__')
+DIGEST_SIZE = 16
+CHUNK_HEADER = struct.Struct('>QI')
+
+
+def map_chunks(function, args, start=0, processes=None,
+               chunk_size=CHUNK_SIZE):
+    """Yield results of function for consecutive chunks of indexes.
+
+    Function gets args, start and stop of chunk. Chunks go from start,
+    without end, and results are yielded in their order. With more than
+    one of processes, chunks are computed in pool of that many processes.
+    """
+    starts = count(start, chunk_size)
+    if not processes or processes == 1:
+        for chunk_start in starts:
+            yield function(*args, chunk_start, chunk_start + chunk_size)
+        return
+    with ProcessPoolExecutor(processes) as executor:
+        pending = deque()
+        try:
+            while True:
+                while len(pending) < 2 * processes:
+                    chunk_start = next(starts)
+                    pending.append(executor.submit(
+                        function, *args, chunk_start,
+                        chunk_start + chunk_size))
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def get_limit(zeros):
+    """Get lowest digest, which does not start with zeros hex zeros."""
+    return (1 << (128 - 4 * zeros)).to_bytes(DIGEST_SIZE, 'big')
+
+
+def search_chunk(prefix, limit, start, stop):
+    """Get (index, digest) of hashes lower than limit for start to stop."""
+    primed = hashlib.md5(prefix.encode())
+    found = []
+    for index in range(start, stop):
+        md5 = primed.copy()
+        md5.update(b'%d' % index)
+        digest = md5.digest()
+        if digest < limit:
+            found.append((index, digest))
+    return found
+
+
+def find_hashes(prefix, zeros, start=0, processes=None,
+                chunk_size=CHUNK_SIZE):
+    """Yield (index, digest) of hashes starting with zeros hex zeros.
+
+    Indexes go from start, in increasing order, without end.
+    """
+    for found in map_chunks(search_chunk, (prefix, get_limit(zeros)),
+                            start, processes, chunk_size):
+        yield from found
+
+
+def find_lowest(prefix, zeros, start=0, processes=None):
+    """Find lowest index from start, hash of which starts with zeros."""
+    index, _ = next(find_hashes(prefix, zeros, start, processes))
+    return index
+
+
+def stretch_hash(text, stretch):
+    """Get digest of text hashed stretch times, each time the hex digest."""
+    md5 = hashlib.md5
+    digest = md5(text.encode()).digest()
+    for _ in range(stretch - 1):
+        digest = md5(digest.hex().encode()).digest()
+    return digest
+
+
+def stretch_chunk(salt, stretch, start, stop):
+    """Get joined stretched digests of salt with indexes start to stop."""
+    return b''.join(stretch_hash(f'{salt}{index}', stretch)
+                    for index in range(start, stop))
+
+
+def iter_stretched(salt, stretch, processes=None,
+                   chunk_size=STRETCHED_CHUNK_SIZE):
+    """Yield hex digests of salt with indexes from 0, hashed stretch times.
+
+    Digests are read from cache, and computed ones are appended to it.
+    """
+    cache_path = get_cache_path(salt, stretch)
+    cached = read_cache(cache_path) if CACHE else b''
+    start = len(cached) // DIGEST_SIZE
+    for index in range(start):
+        yield cached[index * DIGEST_SIZE:(index + 1) * DIGEST_SIZE].hex()
+    if CACHE:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+    for digests in map_chunks(stretch_chunk, (salt, stretch), start,
+                              processes, chunk_size):
+        if CACHE:
+            append_cache(cache_path, start, digests)
+        start += len(digests) // DIGEST_SIZE
+        for index in range(0, len(digests), DIGEST_SIZE):
+            yield digests[index:index + DIGEST_SIZE].hex()
+
+
+def read_cache(path):
+    """Read joined digests cached at path, from index 0 without gaps.
+
+    Chunks starting before the end of digests read so far, appended again
+    by concurrent runs, add only their new digests. Reading stops at chunk
+    starting past the end, or truncated one, and then cache is rewritten
+    with the digests read.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return b''
+    digests = bytearray()
+    offset = 0
+    while offset + CHUNK_HEADER.size <= len(data):
+        start, count = CHUNK_HEADER.unpack_from(data, offset)
+        end = offset + CHUNK_HEADER.size + count * DIGEST_SIZE
+        read = len(digests) // DIGEST_SIZE
+        if start > read or end > len(data):
+            break
+        if start + count > read:
+            digests += data[end - (start + count - read) * DIGEST_SIZE:end]
+        offset = end
+    if offset < len(data):
+        write_cache(path, digests)
+    return bytes(digests)
+
+
+def write_cache(path, digests):
+    """Replace cache at path with single chunk of digests from index 0."""
+    temporary_path = f'{path}.{os.getpid()}'
+    with open(temporary_path, 'wb') as f:
+        f.write(CHUNK_HEADER.pack(0, len(digests) // DIGEST_SIZE))
+        f.write(digests)
+    os.replace(temporary_path, path)
+
+
+def append_cache(path, start, digests):
+    """Append chunk of digests from index start to cache at path.
+
+    Chunk is written with single unbuffered write, not to be interleaved
+    with chunks appended by concurrent runs.
+    """
+    with open(path, 'ab', buffering=0) as f:
+        f.write(CHUNK_HEADER.pack(start, len(digests) // DIGEST_SIZE)
+                + digests)
+
+
+def get_cache_path(salt, stretch):
+    """Get path of cached digests of salt hashed stretch times."""
+    return os.path.join(
+        CACHE_DIR, f'stretched.{salt.encode().hex()}.{stretch}.chunks')
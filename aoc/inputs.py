@@ -0,0 +1,132 @@
+"""Loading of puzzle inputs, with disk cache of parsed inputs.
+
+Input files are memory-mapped and read as streams of lines, integers or
+grid cells. Parsed
+representation of input can be cached on disk, in __pycache__ next to the
+input, keyed by hash of the file and of the source files of the parsing
+code, so repeated runs skip the parsing entirely.
+"""
+import contextlib
+import hashlib
+import inspect
+import marshal
+import mmap
+import os
+import pickle
+
+CACHE = True
+CACHE_DIR = '__pycache__'
+
+
+@contextlib.contextmanager
+def open_input(path='input.txt'):
+    """Open file at path memory-mapped for reading.
+
+    Empty file, which can not be mapped, is opened as empty bytes.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def iter_lines(path='input.txt'):
+    """Iterate over lines of file at path, without line endings."""
+    with open_input(path) as mapped:
+        start = 0
+        size = len(mapped)
+        while start < size:
+            end = mapped.find(b'\n', start)
+            if end == -1:
+                end = size
+            yield mapped[start:end].decode().rstrip('\r')
+            start = end + 1
+
+
+def iter_ints(path='input.txt', separator=None):
+    """Iterate over integers in lines of file, split by separator."""
+    for line in iter_lines(path):
+        for part in line.split(separator):
+            if part.strip():
+                yield int(part)
+
+
+def iter_grid(path='input.txt'):
+    """Iterate over (row, col, char) of grid of characters in file."""
+    for row, line in enumerate(iter_lines(path)):
+        for col, char in enumerate(line):
+            yield row, col, char
+
+
+def read_text(path='input.txt'):
+    """Read whole text of file at path."""
+    with open_input(path) as mapped:
+        return mapped[:].decode()
+
+
+def read_lines(path='input.txt'):
+    """Read list of stripped lines of file at path."""
+    return [line.strip() for line in iter_lines(path)]
+
+
+def read_blocks(path='input.txt'):
+    """Read blocks of text of file, separated by empty lines."""
+    return read_text(path).strip().split('\n\n')
+
+
+def load_cached(parse, path='input.txt', reader=read_lines):
+    """Load input of file at path, read by reader and parsed by parse.
+
+    Parsed input is pickled to cache, and loaded from it while neither
+    file nor source files defining parse and reader change, so helpers
+    called by parse from its own module are tracked too.
+    """
+    if not CACHE:
+        return parse(reader(path))
+    cache_path = get_cache_path(parse, path, reader)
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    parsed = parse(reader(path))
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temporary_path = f'{cache_path}.{os.getpid()}'
+    with open(temporary_path, 'wb') as f:
+        pickle.dump(parsed, f, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, cache_path)
+    return parsed
+
+
+def get_cache_path(parse, path, reader=read_lines):
+    """Get path of cached input of file, parsed with parse and reader."""
+    key = hashlib.sha256()
+    key.update(get_file_hash(path))
+    for function in (parse, reader):
+        key.update(get_source_hash(function))
+    directory, file_name = os.path.split(os.path.abspath(path))
+    return os.path.join(
+        directory, CACHE_DIR,
+        f'{file_name}.{parse.__name__}.{key.hexdigest()[:16]}.pickle')
+
+
+def get_file_hash(path):
+    """Get SHA-256 digest of contents of file at path."""
+    with open_input(path) as mapped:
+        return hashlib.sha256(mapped).digest()
+
+
+def get_source_hash(function):
+    """Get SHA-256 digest of source file defining function.
+
+    Function without source file is hashed by its code.
+    """
+    try:
+        source_path = inspect.getsourcefile(function)
+    except TypeError:
+        source_path = None
+    if source_path is None or not os.path.exists(source_path):
+        return hashlib.sha256(marshal.dumps(function.__code__)).digest()
+    return get_file_hash(source_path)
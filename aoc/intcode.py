@@ -0,0 +1,505 @@
+"""Intcode computer shared by the Advent of Code 2019 solutions.
+
+Memory of the computer is the program list itself. It grows geometrically,
+with zeroes, when program writes past its end. Only addresses above
+DENSE_LIMIT are kept in the sparse state['memory'] dictionary.
+
+With JIT, or jit argument of process_program, basic blocks of the program,
+which are entered HOT_BLOCK_HITS times, are compiled to Python functions.
+Writes into compiled code discard the affected blocks, which are
+interpreted again, until they get hot.
+
+Instructions executed by the interpreter are recorded in state['profile'],
+when it is set to profile of aoc.vm, so it is complete only without JIT.
+"""
+from aoc.inputs import iter_lines
+from aoc.vm import record
+
+ADD = 1
+MULTIPLY = 2
+INPUT = 3
+OUTPUT = 4
+JUMP_IF_TRUE = 5
+JUMP_IF_FALSE = 6
+LESS_THAN = 7
+EQUALS = 8
+ADJUST_RELATIVE = 9
+HALT = 99
+
+POSITION_MODE = 0
+IMMEDIATE_MODE = 1
+RELATIVE_MODE = 2
+
+DENSE_LIMIT = 1 << 20
+JIT = False
+HOT_BLOCK_HITS = 20
+
+PARAMETERS = {
+    ADD: 3,
+    MULTIPLY: 3,
+    INPUT: 1,
+    OUTPUT: 1,
+    JUMP_IF_TRUE: 2,
+    JUMP_IF_FALSE: 2,
+    LESS_THAN: 3,
+    EQUALS: 3,
+    ADJUST_RELATIVE: 1,
+    HALT: 0,
+}
+
+
+def parse_program(line):
+    """Parse comma separated line to the list of intcodes."""
+    return [int(num) for num in line.strip().split(',')]
+
+
+def read_program(path='input.txt'):
+    """Read program from the first line of file at path."""
+    return parse_program(next(iter_lines(path)))
+
+
+def get_state(initial=None, input_value=None):
+    """Get new state, filling initial and optional input_value."""
+    return {
+        'last_position': None,
+        'initial': [initial] if initial is not None else [],
+        'input': [input_value] if input_value is not None else [],
+        'output': [],
+        'relative': 0,
+        'memory': {},
+    }
+
+
+def fork(program, state):
+    """Fork machine to independent copy of its program and state.
+
+    Copy is shallow, as program memory and queues hold only ints, which
+    makes forking fast enough to branch machines in searches. Fork can be
+    also kept aside as snapshot, and forked again to return to it.
+    """
+    forked_state = dict(state)
+    for key in ('initial', 'input', 'output', 'memory', 'compiled'):
+        if key in state:
+            forked_state[key] = state[key].copy()
+    return program[:], forked_state
+
+
+def decode(instruction):
+    """Decode instruction to opcode and modes of its three parameters."""
+    opcode = instruction % 100
+    modes = instruction // 100
+    return opcode, modes % 10, modes // 10 % 10, modes // 100 % 10
+
+
+def get_decoded_instructions():
+    """Get mapping of every valid instruction to its decoded form."""
+    decoded = {}
+    for opcode, parameters in PARAMETERS.items():
+        for modes in range(10 ** parameters):
+            instruction = modes * 100 + opcode
+            opcode, *instruction_modes = decode(instruction)
+            if any(mode > RELATIVE_MODE for mode in instruction_modes):
+                continue
+            decoded[instruction] = (opcode, *instruction_modes)
+    return decoded
+
+
+DECODED = get_decoded_instructions()
+
+
+def grow_memory(program, address):
+    """Grow program to fit address, if it's below DENSE_LIMIT.
+
+    Return new size of the program.
+    """
+    size = len(program)
+    if size <= address < DENSE_LIMIT:
+        new_size = min(max(address + 1, 2 * size), DENSE_LIMIT)
+        program.extend([0] * (new_size - size))
+    return len(program)
+
+
+def process_program(program, state, jit=None):
+    """Process program, starting from the last position saved in state.
+
+    Program is run until it halts, which marks state as finished, or until
+    it needs input, when none is available. In the latter case the position
+    of input instruction is kept in state, so calling process_program again,
+    after adding input, resumes execution. With jit hot basic blocks are
+    compiled to Python functions, jit defaults to module's JIT.
+    """
+    if jit is None:
+        jit = JIT
+    if not jit:
+        execute(program, state)
+        return program, state
+
+    compiled = state.get('compiled')
+    if compiled is None:
+        compiled = state['compiled'] = CompiledBlocks()
+    blocks = compiled.blocks
+    hits = compiled.hits
+    code = compiled.code
+    memory = state['memory']
+    output = state['output']
+    position = state['last_position'] or 0
+    relative = state['relative']
+    while True:
+        block = blocks.get(position)
+        if block is None:
+            hits[position] = hits.get(position, 0) + 1
+            if hits[position] >= HOT_BLOCK_HITS:
+                block = compiled.compile_block(program, position)
+        if block:
+            position, relative, written = block(
+                program, memory, output, relative, code)
+            if written is not None:
+                compiled.discard(written)
+            continue
+        state['last_position'] = position
+        state['relative'] = relative
+        if not execute(program, state, compiled):
+            return program, state
+        position = state['last_position']
+        relative = state['relative']
+
+
+def generate_output(program, state, inputs=()):
+    """Generate output of program, taking input values from inputs iterable.
+
+    Values are taken from inputs lazily, only when program needs them, so
+    generators of programs can be chained, with the output of one being
+    input of the next one. Generator stops when program halts, or when it
+    needs input and inputs are exhausted.
+    """
+    inputs = iter(inputs)
+    output = state['output']
+    while True:
+        process_program(program, state)
+        yield from output
+        output.clear()
+        if 'finished' in state:
+            return
+        try:
+            state['input'].append(next(inputs))
+        except StopIteration:
+            return
+
+
+def execute(program, state, compiled=None):
+    """Execute program from the last position saved in state.
+
+    With compiled blocks, execution stops after the first jump, with writes
+    into compiled code discarding affected blocks. Returns True if stopped
+    after jump, False when program halted, or is waiting for input.
+    """
+    initial = state['initial']
+    inputs = state['input']
+    output = state['output']
+    memory = state['memory']
+    relative = state['relative']
+    position = state['last_position'] or 0
+    size = len(program)
+    decoded = DECODED
+    code = compiled.code if compiled is not None else None
+    profile = state.get('profile')
+    previous = None
+    jumped = False
+    while True:
+        try:
+            opcode, mode1, mode2, mode3 = decoded[program[position]]
+        except KeyError:
+            raise ValueError(f'Unknown instruction {program[position]} '
+                             f'at position {position}') from None
+        if profile is not None:
+            record(profile, previous, position, opcode)
+            previous = position
+
+        if opcode == HALT:
+            state['finished'] = True
+            break
+
+        if opcode == INPUT:
+            if initial:
+                value = initial.pop(0)
+            elif inputs:
+                value = inputs.pop(0)
+            else:
+                break
+            target = program[position + 1]
+            if mode1 == RELATIVE_MODE:
+                target += relative
+            if target >= size:
+                size = grow_memory(program, target)
+            if target < size:
+                program[target] = value
+            else:
+                memory[target] = value
+            if code is not None and target < len(code) and code[target]:
+                compiled.discard(target)
+            position += 2
+            continue
+
+        first = program[position + 1]
+        if mode1 != IMMEDIATE_MODE:
+            if mode1 == RELATIVE_MODE:
+                first += relative
+            first = program[first] if first < size else memory.get(first, 0)
+
+        if opcode == OUTPUT:
+            output.append(first)
+            position += 2
+            continue
+        if opcode == ADJUST_RELATIVE:
+            relative += first
+            position += 2
+            continue
+
+        second = program[position + 2]
+        if mode2 != IMMEDIATE_MODE:
+            if mode2 == RELATIVE_MODE:
+                second += relative
+            second = (program[second] if second < size
+                      else memory.get(second, 0))
+
+        if opcode == JUMP_IF_TRUE or opcode == JUMP_IF_FALSE:
+            if (opcode == JUMP_IF_TRUE) == (first != 0):
+                position = second
+            else:
+                position += 3
+            if compiled is not None:
+                jumped = True
+                break
+            continue
+
+        if opcode == ADD:
+            value = first + second
+        elif opcode == MULTIPLY:
+            value = first * second
+        elif opcode == LESS_THAN:
+            value = 1 if first < second else 0
+        else:
+            value = 1 if first == second else 0
+
+        target = program[position + 3]
+        if mode3 == RELATIVE_MODE:
+            target += relative
+        if target >= size:
+            size = grow_memory(program, target)
+        if target < size:
+            program[target] = value
+        else:
+            memory[target] = value
+        if code is not None and target < len(code) and code[target]:
+            compiled.discard(target)
+        position += 4
+
+    state['last_position'] = position
+    state['relative'] = relative
+    return jumped
+
+
+class CompiledBlocks:
+    """Basic blocks of program compiled to Python functions.
+
+    Block is compiled from its starting position up to, and including, the
+    first jump. It stops before input and halt instructions, which are left
+    for interpreter. Each block function takes program, memory, output,
+    relative base and code, and returns next position, relative base and
+    address written into compiled code, or None. Addresses which were
+    written to are volatile, and are read from program when compiled again.
+
+    Code is bytearray marking addresses, which were compiled into blocks.
+    Compiled functions are cached in BLOCK_CACHE together with the code
+    they were compiled from, and reused by machines running the same code,
+    with program at least as long as the one block was compiled from.
+    """
+
+    def __init__(self):
+        self.blocks = {}
+        self.hits = {}
+        self.ranges = {}
+        self.code = bytearray()
+        self.volatile = set()
+
+    def copy(self):
+        """Copy compiled blocks, sharing hits counters with the copy."""
+        copied = CompiledBlocks()
+        copied.blocks = self.blocks.copy()
+        copied.hits = self.hits
+        copied.ranges = self.ranges.copy()
+        copied.code = self.code[:]
+        copied.volatile = self.volatile.copy()
+        return copied
+
+    def compile_block(self, program, start):
+        """Compile block of program from start position.
+
+        Returns compiled function, or False if block can't be compiled.
+        """
+        for size, end, code, mask, block in BLOCK_CACHE.get(start, ()):
+            if len(program) >= size and program[start:end] == code:
+                break
+        else:
+            source, end = get_block_source(program, start, self.volatile)
+            if source is None:
+                self.blocks[start] = False
+                return False
+            namespace = {'grow_memory': grow_memory}
+            exec(compile(source, f'<intcode block {start}>', 'exec'),
+                 namespace)
+            block = namespace['block']
+            mask = int.from_bytes(bytes(
+                address not in self.volatile
+                for address in range(start, end)), 'big')
+            variants = BLOCK_CACHE.setdefault(start, [])
+            if len(variants) < BLOCK_CACHE_VARIANTS:
+                variants.append(
+                    (len(program), end, program[start:end], mask, block))
+        self.blocks[start] = block
+        self.ranges[start] = (end, mask)
+        self.mark_code(start, end, mask)
+        return block
+
+    def mark_code(self, start, end, mask):
+        """Mark addresses from start to end, which are set in mask, as code."""
+        if len(self.code) < end:
+            self.code.extend(bytes(end - len(self.code)))
+        marked = int.from_bytes(self.code[start:end], 'big') | mask
+        self.code[start:end] = marked.to_bytes(end - start, 'big')
+
+    def discard(self, address):
+        """Discard blocks compiled from code at address."""
+        self.volatile.add(address)
+        discarded = [
+            (start, end) for start, (end, _) in self.ranges.items()
+            if start <= address < end]
+        for start, end in discarded:
+            del self.ranges[start]
+            del self.blocks[start]
+            self.hits[start] = 0
+            self.code[start:end] = bytes(end - start)
+        for start, (end, mask) in self.ranges.items():
+            if any(start < other_end and other_start < end
+                   for other_start, other_end in discarded):
+                self.mark_code(start, end, mask)
+
+
+BLOCK_CACHE = {}
+BLOCK_CACHE_VARIANTS = 8
+
+
+def get_block_source(program, start, volatile=()):
+    """Get Python source of block function starting at start position.
+
+    Operands at volatile addresses are read from program when block is run,
+    instruction at volatile address ends the block. Returns source and end
+    position of the block, or None and start, if block would be empty.
+    """
+    lines = [
+        'def block(program, memory, output, relative, code):',
+        '    size = len(program)',
+    ]
+    position = start
+    size = len(program)
+    while True:
+        decoded = DECODED.get(program[position]) if position < size else None
+        if (decoded is None or decoded[0] in (INPUT, HALT)
+                or position in volatile):
+            break
+        opcode, *modes = decoded
+        next_position = position + PARAMETERS[opcode] + 1
+        if next_position > size:
+            break
+        operands = [
+            f'program[{address}]' if address in volatile else program[address]
+            for address in range(position + 1, next_position)]
+        values = [
+            get_value_source(lines, f'value{number}', operand, mode, size)
+            for number, (operand, mode) in enumerate(
+                zip(operands[:2], modes), start=1)]
+        position = next_position
+        if opcode == OUTPUT:
+            lines.append(f'    output.append({values[0]})')
+        elif opcode == ADJUST_RELATIVE:
+            lines.append(f'    relative += {values[0]}')
+        elif opcode in (JUMP_IF_TRUE, JUMP_IF_FALSE):
+            condition, target = values
+            if opcode == JUMP_IF_FALSE:
+                condition = f'not {condition}'
+            lines.append(f'    return ({target} if {condition} else '
+                         f'{next_position}), relative, None')
+            return '\n'.join(lines) + '\n', position
+        else:
+            lines.extend(get_write_source(opcode, values, operands[2],
+                                          modes[2], next_position))
+    if position == start:
+        return None, start
+    lines.append(f'    return {position}, relative, None')
+    return '\n'.join(lines) + '\n', position
+
+
+def get_value_source(lines, name, operand, mode, size):
+    """Get source of operand value, adding needed statements to lines.
+
+    Operand is either int, or source reading it from program. Immediate
+    operands and addresses in position mode, which are in program at compile
+    time, are put directly in the returned source.
+    """
+    if mode == IMMEDIATE_MODE:
+        return str(operand)
+    if mode == POSITION_MODE and isinstance(operand, int) and (
+            0 <= operand < size):
+        return f'program[{operand}]'
+    address = name
+    if mode == RELATIVE_MODE:
+        lines.append(f'    {name} = relative + {operand}')
+    else:
+        lines.append(f'    {name} = {operand}')
+    lines.append(f'    {name} = (program[{address}] if {address} < size '
+                 f'else memory.get({address}, 0))')
+    return name
+
+
+OPERATION_SOURCES = {
+    ADD: '{} + {}',
+    MULTIPLY: '{} * {}',
+    LESS_THAN: '1 if {} < {} else 0',
+    EQUALS: '1 if {} == {} else 0',
+}
+OPERATIONS = {
+    ADD: lambda first, second: first + second,
+    MULTIPLY: lambda first, second: first * second,
+    LESS_THAN: lambda first, second: 1 if first < second else 0,
+    EQUALS: lambda first, second: 1 if first == second else 0,
+}
+
+
+def get_write_source(opcode, values, target, target_mode, next_position):
+    """Get source lines of operation, writing its result to target.
+
+    Result of operation on two immediate values is calculated at compile
+    time. Writing into compiled code returns from the block.
+    """
+    if all(value.lstrip('-').isdigit() for value in values):
+        result = str(OPERATIONS[opcode](*map(int, values)))
+    else:
+        result = OPERATION_SOURCES[opcode].format(*values)
+    lines = []
+    if target_mode == RELATIVE_MODE:
+        lines.append(f'    target = relative + {target}')
+        target = 'target'
+    elif isinstance(target, str):
+        lines.append(f'    target = {target}')
+        target = 'target'
+    lines.extend([
+        f'    if {target} >= size:',
+        f'        size = grow_memory(program, {target})',
+        f'    if {target} < size:',
+        f'        program[{target}] = {result}',
+        '    else:',
+        f'        memory[{target}] = {result}',
+        f'    if {target} < len(code) and code[{target}]:',
+        f'        return {next_position}, relative, {target}',
+    ])
+    return lines
@@ -0,0 +1,65 @@
+"""Knot hash shared by the Advent of Code 2017 solutions.
+
+Marks are bytes, kept rotated with the current position at the start, so
+every reversal is a slice from the start of bytearray, without wrapping
+around its end. Rotation is undone only after the last round.
+
+Rows of disk grid are knot hashes packed to ints, with the first square
+in the highest bit, and can be hashed in parallel by a process pool.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from operator import xor
+
+SIZE = 256
+ROUNDS = 64
+SUFFIX = (17, 31, 73, 47, 23)
+BLOCK_SIZE = 16
+GRID_SIZE = 128
+
+
+def knot(lengths, rounds=1, size=SIZE):
+    """Knot marks from 0 to size - 1 with lengths, repeated for rounds.
+
+    Marks are bytes, so size can be at most 256. Returns bytearray.
+    """
+    marks = bytearray(range(size))
+    rotation = 0
+    skip = 0
+    for _ in range(rounds):
+        for length in lengths:
+            marks[:length] = marks[:length][::-1]
+            shift = (length + skip) % size
+            marks = marks[shift:] + marks[:shift]
+            rotation = (rotation + shift) % size
+            skip += 1
+    split = size - rotation
+    return marks[split:] + marks[:split]
+
+
+def get_dense_hash(sparse_hash):
+    """Get dense hash bytes, xoring blocks of sparse_hash."""
+    return bytes(reduce(xor, sparse_hash[start:start + BLOCK_SIZE])
+                 for start in range(0, len(sparse_hash), BLOCK_SIZE))
+
+
+def knot_hash(text):
+    """Get knot hash bytes of text."""
+    lengths = list(text.encode()) + list(SUFFIX)
+    return get_dense_hash(knot(lengths, ROUNDS))
+
+
+def get_row(key, row):
+    """Get row of disk grid for key, as bits of int."""
+    return int.from_bytes(knot_hash(f'{key}-{row}'), 'big')
+
+
+def get_rows(key, processes=None):
+    """Get rows of disk grid for key, hashing them with processes."""
+    if not processes or processes == 1:
+        return [get_row(key, row) for row in range(GRID_SIZE)]
+    keys = [key] * GRID_SIZE
+    with ProcessPoolExecutor(processes) as executor:
+        return list(executor.map(
+            get_row, keys, range(GRID_SIZE),
+            chunksize=-(-GRID_SIZE // processes)))
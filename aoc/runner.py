@@ -0,0 +1,227 @@
+"""Running solutions of the days, with timing of every printed answer.
+
+Each day is run in a fresh process, from its own directory, so it reads
+its input.txt and its peak memory usage is not mixed with other days.
+With more jobs, days are run in parallel, longest expected first by
+timings of previous report, and results are streamed as they complete.
+"""
+import concurrent.futures
+import io
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import traceback
+
+from aoc.days import get_days, get_day_path, load_day, parse_days
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def run(years, days_spec=None, timeout=None, output=None, jobs=1,
+        timings=None):
+    """Run days selected by days_spec from years, and write JSON report.
+
+    Days are run in jobs processes in parallel, ordered by their wall time
+    in timings report, when given. Report is written to output file, or
+    printed when output is None. Returns list of results of the days.
+    """
+    days = [(year, day)
+            for year in years
+            for day in parse_days(days_spec, get_days(year))]
+    if jobs == 1:
+        completed = (run_in_process(year, day, timeout) for year, day in days)
+    else:
+        expected = read_timings(timings, timeout) if timings else {}
+        completed = run_in_parallel(days, jobs, timeout, expected)
+    results = []
+    for result in completed:
+        print(format_result(result), file=sys.stderr)
+        results.append(result)
+    results.sort(key=lambda result: (result['year'], result['day']))
+    write_report(results, output)
+    return results
+
+
+def run_in_parallel(days, jobs=None, timeout=None, expected=None):
+    """Run days in pool of jobs processes, yielding results as completed.
+
+    Days with longest expected wall time are started first, and days
+    without expected time before all of them. Every process runs only one
+    day, so days do not share working directory, modules or peak memory.
+    """
+    expected = expected or {}
+    days = sorted(days, key=lambda day: -expected.get(day, float('inf')))
+    with concurrent.futures.ProcessPoolExecutor(
+            jobs, mp_context=multiprocessing.get_context('spawn'),
+            max_tasks_per_child=1) as executor:
+        pending = {
+            executor.submit(run_day_with_timeout, year, day, timeout):
+                (year, day)
+            for year, day in days}
+        for future in concurrent.futures.as_completed(pending):
+            try:
+                yield future.result()
+            except Exception:
+                yield get_result(*pending[future],
+                                 error=traceback.format_exc())
+
+
+def read_timings(path, timeout=None):
+    """Read wall times of days from JSON report, keyed by (year, day).
+
+    Days which timed out in the report are expected to take timeout.
+    """
+    with open(path) as f:
+        report = json.load(f)
+    timings = {}
+    for result in report['results']:
+        wall_time = result['wall_time']
+        if wall_time is None and timeout is not None:
+            wall_time = timeout
+        if wall_time is not None:
+            timings[result['year'], result['day']] = wall_time
+    return timings
+
+
+def run_in_process(year, day, timeout=None):
+    """Run day of year in new process, with optional timeout in seconds.
+
+    Process is not daemonic, so day can start its own process pool.
+    """
+    result, = run_in_parallel([(year, day)], 1, timeout)
+    return result
+
+
+class DayTimeout(Exception):
+    """Raised in day running longer than its timeout."""
+
+
+def run_day_with_timeout(year, day, timeout=None):
+    """Run day of year, interrupted by alarm signal after timeout seconds.
+
+    Without alarm signals available, day is run without timeout.
+    """
+    if timeout is None or not hasattr(signal, 'setitimer'):
+        return run_day(year, day)
+
+    def on_alarm(*_):
+        raise DayTimeout(f'Timeout after {timeout} s')
+
+    signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return run_day(year, day)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def run_day(year, day):
+    """Run main of day of year, capturing its output with timing.
+
+    Every printed line is an answer, with wall and CPU time spent since
+    the previous line, and peak memory usage of process after it.
+    """
+    result = get_result(year, day)
+    os.chdir(os.path.dirname(get_day_path(year, day)))
+    sys.path.insert(0, os.getcwd())
+    answers = TimedOutput()
+    stdout = sys.stdout
+    sys.stdout = answers
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    try:
+        load_day(year, day).main()
+    except BaseException:
+        result['error'] = traceback.format_exc()
+    finally:
+        sys.stdout = stdout
+    answers.flush()
+    result['answers'] = answers.answers
+    result['wall_time'] = time.perf_counter() - start_wall
+    result['cpu_time'] = time.process_time() - start_cpu
+    result['peak_rss_kb'] = get_peak_rss_kb()
+    return result
+
+
+def get_result(year, day, error=None):
+    """Get empty result of day of year."""
+    return {
+        'year': year,
+        'day': day,
+        'answers': [],
+        'wall_time': None,
+        'cpu_time': None,
+        'peak_rss_kb': None,
+        'error': error,
+    }
+
+
+class TimedOutput(io.StringIO):
+    """Output recording every written line, with timing since previous."""
+
+    def __init__(self):
+        super().__init__()
+        self.answers = []
+        self.last_wall = time.perf_counter()
+        self.last_cpu = time.process_time()
+        self.pending = ''
+
+    def write(self, text):
+        lines = (self.pending + text).split('\n')
+        self.pending = lines.pop()
+        for line in lines:
+            self.add_answer(line)
+        return len(text)
+
+    def flush(self):
+        if self.pending:
+            self.add_answer(self.pending)
+            self.pending = ''
+
+    def add_answer(self, line):
+        """Add answer line, with time spent since the previous one."""
+        wall, cpu = time.perf_counter(), time.process_time()
+        self.answers.append({
+            'output': line,
+            'wall_time': wall - self.last_wall,
+            'cpu_time': cpu - self.last_cpu,
+            'peak_rss_kb': get_peak_rss_kb(),
+        })
+        self.last_wall, self.last_cpu = wall, cpu
+
+
+def get_peak_rss_kb():
+    """Get peak resident memory of current process in kB, if available."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak // 1024
+    return peak
+
+
+def format_result(result):
+    """Format result of day to one line summary."""
+    summary = f"{result['year']} day {result['day']:>2}: "
+    if result['wall_time'] is not None:
+        summary += (f"{result['wall_time']:.3f} s wall, "
+                    f"{result['cpu_time']:.3f} s CPU, "
+                    f"{result['peak_rss_kb']} kB peak")
+    if result['error']:
+        summary += f" ERROR {result['error'].strip().splitlines()[-1]}"
+    return summary
+
+
+def write_report(results, output=None):
+    """Write JSON report of results to output path, or to stdout."""
+    report = json.dumps({'results': results}, indent=2)
+    if output is None:
+        print(report)
+        return
+    with open(output, 'w') as f:
+        f.write(report + '\n')
@@ -0,0 +1,135 @@
+"""Toolkit shared by the virtual machines of the solutions.
+
+Program is decoded once to Program of instruction names and operations,
+closures bound to the machine state and to operands of their instruction.
+Operation gets pointer of its instruction and returns pointer of the next
+one, so run dispatches every instruction with a single call.
+
+Machines with their own dispatch loops, like intcode, assembunny and
+elfcode, take optional profile and record every executed instruction into
+it. Profile counts hits of every pointer and opcode, and jumps backwards,
+which close loops. Loops executing the most instructions are reported,
+with their instructions, as candidates for optimization. Instructions of
+nested loops are counted only in the innermost one.
+"""
+from collections import Counter, namedtuple
+
+Program = namedtuple('Program', 'names operations')
+
+
+def decode(instructions, decoders, *context):
+    """Decode instructions to Program, with operations bound to context.
+
+    Instructions are tuples of name and operands, decoders map names to
+    functions getting context and operands, and returning operation.
+    """
+    return Program(
+        [name for name, *_ in instructions],
+        [decoders[name](*context, *operands)
+         for name, *operands in instructions])
+
+
+def run(program, pointer=0, profile=None):
+    """Run decoded program from pointer, until pointer leaves it.
+
+    Returns pointer after the last executed instruction.
+    """
+    operations = program.operations
+    size = len(operations)
+    if profile is not None:
+        previous = None
+        while 0 <= pointer < size:
+            record(profile, previous, pointer, program.names[pointer])
+            previous = pointer
+            pointer = operations[pointer](pointer)
+        return pointer
+    while 0 <= pointer < size:
+        pointer = operations[pointer](pointer)
+    return pointer
+
+
+def get_profile():
+    """Get empty profile, counting pointers, opcodes and backward jumps."""
+    return {
+        'pointers': Counter(),
+        'opcodes': Counter(),
+        'jumps': Counter(),
+    }
+
+
+def record(profile, previous, pointer, opcode):
+    """Record execution of opcode at pointer, after instruction at previous.
+
+    Previous is None for the first executed instruction.
+    """
+    profile['pointers'][pointer] += 1
+    profile['opcodes'][opcode] += 1
+    if previous is not None and pointer <= previous:
+        profile['jumps'][previous, pointer] += 1
+
+
+def get_hot_loops(profile, limit=5):
+    """Get loops executing the most instructions, at most limit of them.
+
+    Loop spans from target of backward jump, taken at least twice, to its
+    source. Every instruction is counted only in the shortest loop around
+    it, so nested and overlapping loops do not share executed instructions.
+    Returns list of (start, end, counted pointers, executed instructions,
+    iterations) tuples.
+    """
+    pointers = profile['pointers']
+    spans = sorted(
+        ((start, end), iterations)
+        for (end, start), iterations in profile['jumps'].items()
+        if iterations > 1)
+    counted = {span: [] for span, _ in spans}
+    for pointer in pointers:
+        around = [span for span, _ in spans
+                  if span[0] <= pointer <= span[1]]
+        if around:
+            counted[min(around, key=lambda span: span[1] - span[0])].append(
+                pointer)
+    loops = [
+        (start, end, sorted(counted[start, end]),
+         sum(pointers[pointer] for pointer in counted[start, end]),
+         iterations)
+        for (start, end), iterations in spans if counted[start, end]]
+    loops.sort(key=lambda loop: (-loop[3], loop[0]))
+    return loops[:limit]
+
+
+def report(profile, listing=None, limit=5):
+    """Report opcodes and hot loops of profile, as list of lines.
+
+    With listing, sequence of instructions indexed by pointer, instructions
+    counted in every hot loop are listed too, with their hits.
+    """
+    pointers = profile['pointers']
+    total = sum(pointers.values())
+    lines = [f'Executed instructions: {total}', 'Opcodes:']
+    for opcode, hits in profile['opcodes'].most_common():
+        lines.append(f'  {opcode}: {hits} ({get_share(hits, total)})')
+    lines.append('Hot loops:')
+    for start, end, counted, executed, iterations in get_hot_loops(
+            profile, limit):
+        lines.append(
+            f'  {start}-{end}: {executed} instructions '
+            f'({get_share(executed, total)}), {iterations} iterations')
+        if listing is not None:
+            lines.extend(
+                f'    {pointer}: {format_instruction(listing[pointer])} '
+                f'({pointers[pointer]})'
+                for pointer in counted)
+    return lines
+
+
+def get_share(count, total):
+    """Get count as percentage of total."""
+    return f'{count / total:.1%}' if total else '0.0%'
+
+
+def format_instruction(instruction):
+    """Format instruction, either string or tuple of name and operands."""
+    if isinstance(instruction, str):
+        return instruction
+    return ' '.join(str(part) for part in instruction)